@@ -2,33 +2,18 @@
 
 PACKAGE_NAME=censys
 
+# Reuse output specs generated by previous builds while nothing they depend on changed
+export CENSYS_OUTPUT_SPEC_CACHE="${CENSYS_OUTPUT_SPEC_CACHE:-.build_cache/output_specs}"
+
 if ! soarapps package build --output-file $PACKAGE_NAME.tgz; then
     echo "Failed to build package"
     return 1
 fi
 
-echo "Unpacking manifest..."
-if ! tar xzf $PACKAGE_NAME.tgz; then
-    echo "Failed to unpack manifest."
-    return 1
-fi
-
 echo "Fixing manifest dependencies..."
-if ! python ./fix_manifest.py; then
+if ! python ./fix_manifest.py $PACKAGE_NAME.tgz; then
     echo "Failed to fix manifest dependencies."
     return 1
 fi
 
-echo "Repacking manifest..."
-if ! tar -cvzf $PACKAGE_NAME.tgz $PACKAGE_NAME; then
-    echo "Failed to fix manifest dependencies."
-    return 1
-fi
-
-echo "Cleaning unpacked directory..."
-if ! rm -rf ./$PACKAGE_NAME/; then
-    echo "Failed to clean up unpacked directory."
-    return 1
-fi
-
 echo "Done."
@@ -1,9 +1,13 @@
+from io import BytesIO
 from pathlib import Path
 import re
+import sys
+import tarfile
 
 
-extracted_manifest_path = Path("censys") / "manifest.json"
-replacement_manifest_path = Path("censys") / "replacement_manifest.json"
+package_path = Path(sys.argv[1] if len(sys.argv) > 1 else "censys.tgz")
+replacement_package_path = package_path.with_name(f".{package_path.name}.tmp")
+manifest_name = "censys/manifest.json"
 
 pattern = r"""manylinux[a-zA-Z0-9\-_]+_(aarch64)"""
 replacement = "x86_64"
@@ -13,19 +17,23 @@ def replace_platform(match):
     return match.group(0).replace("aarch64", replacement)
 
 
-def process_line(line: str) -> str:
-    if line.strip().startswith('"input_file"'):
-        return re.sub(pattern, replace_platform, line)
-
-    return line
-
-
+# Copy the package member by member in a single streaming pass, rewriting only the
+# manifest, rather than extracting the whole package to disk and repacking it
 with (
-    open(extracted_manifest_path) as infile,
-    open(replacement_manifest_path, "w") as outfile,
+    tarfile.open(str(package_path), "r|gz") as infile,
+    tarfile.open(str(replacement_package_path), "w|gz") as outfile,
 ):
-    for line in infile:
-        outfile.write(re.sub(pattern, replace_platform, line))
+    for member in infile:
+        if member.name != manifest_name:
+            outfile.addfile(
+                member, infile.extractfile(member) if member.isfile() else None
+            )
+            continue
+
+        manifest = infile.extractfile(member).read().decode()
+        fixed_manifest = re.sub(pattern, replace_platform, manifest).encode()
+        member.size = len(fixed_manifest)
+        outfile.addfile(member, BytesIO(fixed_manifest))
 
 
-replacement_manifest_path.rename(extracted_manifest_path)
+replacement_package_path.replace(package_path)
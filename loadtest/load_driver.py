@@ -0,0 +1,303 @@
+"""
+Runs the app's real action functions against a Platform API (by default, an in-process
+stub) with N concurrent workers, and reports throughput and latency percentiles.
+
+    python -m loadtest.load_driver --workers 16 --runs 2000 --mix host=4,web=2,search=1
+
+Workers are threads by default. Pass `--processes` to run each worker in its own
+process, which is closer to how SOAR runs actions.
+"""
+
+import argparse
+import itertools
+import logging
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from soar_sdk.action_results import ActionResult
+from soar_sdk.logging import getLogger
+
+from src.actions.lookup_cert import GetCertActionParams, lookup_cert
+from src.actions.lookup_host import GetHostActionParams, lookup_host
+from src.actions.lookup_ip_range import LookupIpRangeActionParams, lookup_ip_range
+from src.actions.lookup_web_properties import (
+    LookupWebPropertiesActionParams,
+    lookup_web_properties,
+)
+from src.actions.lookup_web_property import (
+    GetWebPropertyActionParams,
+    lookup_web_property,
+)
+from src.actions.search import SearchActionParams, search
+from src.config import Asset
+
+from .stub_server import StubConfig, StubPlatformAPI
+
+
+def _host(i: int) -> tuple[Callable, Any]:
+    return lookup_host, GetHostActionParams(ip=f"198.51.100.{i % 256}")
+
+
+def _cert(i: int) -> tuple[Callable, Any]:
+    return lookup_cert, GetCertActionParams(fingerprint_sha256=f"{i:064x}")
+
+
+def _web(i: int) -> tuple[Callable, Any]:
+    return lookup_web_property, GetWebPropertyActionParams(
+        hostname=f"www{i}.example.com", port=443
+    )
+
+
+def _web_bulk(i: int) -> tuple[Callable, Any]:
+    return lookup_web_properties, LookupWebPropertiesActionParams(
+        targets=",".join(f"www{i + n}.example.com:443" for n in range(10)),
+        expand_ip=f"198.51.100.{i % 256}",
+    )
+
+
+def _search(i: int) -> tuple[Callable, Any]:
+    return search, SearchActionParams(query=f'host.services.port: "{i % 65535}"')
+
+
+def _ip_range(i: int) -> tuple[Callable, Any]:
+    return lookup_ip_range, LookupIpRangeActionParams(
+        ip_range=f"203.0.113.{(i % 16) * 16}/28"
+    )
+
+
+SCENARIOS: dict[str, Callable[[int], tuple[Callable, Any]]] = {
+    "host": _host,
+    "cert": _cert,
+    "web": _web,
+    "web_bulk": _web_bulk,
+    "search": _search,
+    "ip_range": _ip_range,
+}
+
+
+class _RecordingSoarClient:
+    """
+    The subset of `SOARClient` used by the actions, keeping the last summary and
+    message instead of reporting them to SOAR.
+    """
+
+    def __init__(self) -> None:
+        self.summary: Any = None
+        self.message: str | None = None
+
+    def set_summary(self, summary: Any) -> None:
+        self.summary = summary
+
+    def set_message(self, message: str) -> None:
+        self.message = message
+
+    def get_summary(self) -> Any:
+        return self.summary
+
+    def get_message(self) -> str | None:
+        return self.message
+
+
+@dataclass
+class RunResult:
+    scenario: str
+    outcome: str
+    seconds: float
+    requests: int = 0
+
+
+def run_once(
+    scenario: str, index: int, base_url: str, org_id: str, max_in_flight: int = 0
+) -> RunResult:
+    """
+    Runs a single action and classifies its outcome. Kept at module level so that it
+    can be sent to worker processes.
+    """
+    action, params = SCENARIOS[scenario](index)
+    asset = Asset(
+        base_url=base_url,
+        api_token="load-test",  # noqa: S106
+        organization_id=org_id,
+        max_concurrent_requests=max_in_flight,
+    )
+    soar = _RecordingSoarClient()
+
+    started = time.perf_counter()
+    try:
+        result = action(params, asset, soar)
+        if isinstance(result, ActionResult) and not result.get_status():
+            outcome = f"Failed: {result.get_message()}"
+        else:
+            outcome = "ok"
+    except Exception as err:
+        outcome = f"{type(err).__name__}: {err}"
+    seconds = time.perf_counter() - started
+
+    requests = getattr(soar.summary, "requests", 0) if soar.summary else 0
+    return RunResult(scenario, outcome, seconds, requests)
+
+
+def parse_mix(value: str) -> list[str]:
+    """
+    Parses a weighted scenario mix such as `host=4,search=1` into a list of scenario
+    names to sample from.
+    """
+    weighted: list[str] = []
+    for part in value.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(
+                f"Unknown scenario '{name}', expected one of: {', '.join(SCENARIOS)}"
+            )
+        weighted.extend([name] * int(weight or 1))
+    return weighted
+
+
+def percentile(quantiles: list[float], pct: int) -> float:
+    return quantiles[pct - 1] if quantiles else 0.0
+
+
+def report(results: list[RunResult], elapsed: float, workers: int) -> str:
+    throughput = len(results) / elapsed
+    lines = [
+        f"{len(results):,} run(s) with {workers} worker(s) in {elapsed:.2f}s ({throughput:.1f} runs/s)"
+    ]
+
+    by_scenario: dict[str, list[RunResult]] = {}
+    for result in results:
+        by_scenario.setdefault(result.scenario, []).append(result)
+
+    lines.append(
+        f"{'scenario':<10} {'runs':>7} {'ok':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/run':>8}"
+    )
+    for scenario, runs in sorted(by_scenario.items()):
+        latencies = sorted(r.seconds * 1000 for r in runs)
+        quantiles = (
+            statistics.quantiles(latencies, n=100, method="inclusive")
+            if len(latencies) > 1
+            else latencies * 99
+        )
+        lines.append(
+            f"{scenario:<10} {len(runs):>7,} {sum(r.outcome == 'ok' for r in runs):>7,} "
+            f"{percentile(quantiles, 50):>9.1f} {percentile(quantiles, 95):>9.1f} "
+            f"{percentile(quantiles, 99):>9.1f} "
+            f"{sum(r.requests for r in runs) / len(runs):>8.2f}"
+        )
+
+    failures = Counter(r.outcome for r in results if r.outcome != "ok")
+    if failures:
+        lines.append("Failures:")
+        lines.extend(
+            f"  {count:>7,}  {outcome}" for outcome, count in failures.most_common(10)
+        )
+
+    return "\n".join(lines)
+
+
+def run_load(
+    base_url: str,
+    mix: list[str],
+    runs: int,
+    workers: int,
+    distinct: int,
+    executor_cls: type[Executor] = ThreadPoolExecutor,
+    seed: int | None = None,
+    max_in_flight: int = 0,
+) -> tuple[list[RunResult], float]:
+    rng = random.Random(seed)  # noqa: S311
+    org_id = str(uuid.uuid4())
+    plan = [(rng.choice(mix), rng.randrange(distinct)) for _ in range(runs)]
+
+    started = time.perf_counter()
+    with executor_cls(max_workers=workers) as executor:
+        results = list(
+            executor.map(
+                run_once,
+                *zip(*plan, strict=True),
+                itertools.repeat(base_url, runs),
+                itertools.repeat(org_id, runs),
+                itertools.repeat(max_in_flight, runs),
+            )
+        )
+    return results, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", help="Use this API instead of a local stub")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--mix", default="host=4,cert=1,web=2,search=1")
+    parser.add_argument(
+        "--distinct",
+        type=int,
+        default=1000,
+        help="Number of distinct resources to look up; lower values exercise caching",
+    )
+    parser.add_argument("--processes", action="store_true")
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=0,
+        help="Set the asset's max_concurrent_requests limit (0 for unlimited)",
+    )
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="Show action logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Failures are summarized in the report instead
+        getLogger().setLevel(logging.CRITICAL)
+
+    mix = parse_mix(args.mix)
+    executor_cls = ProcessPoolExecutor if args.processes else ThreadPoolExecutor
+
+    if args.base_url:
+        results, elapsed = run_load(
+            args.base_url,
+            mix,
+            args.runs,
+            args.workers,
+            args.distinct,
+            executor_cls,
+            args.seed,
+            args.max_in_flight,
+        )
+        print(report(results, elapsed, args.workers))
+        return
+
+    config = StubConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    with StubPlatformAPI(config) as api:
+        results, elapsed = run_load(
+            api.base_url,
+            mix,
+            args.runs,
+            args.workers,
+            args.distinct,
+            executor_cls,
+            args.seed,
+            args.max_in_flight,
+        )
+
+    print(report(results, elapsed, args.workers))
+    print(f"Stub responses by status: {dict(sorted(api.statuses.items()))}")
+    print(f"Stub peak requests in flight: {api.peak_in_flight}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+A local stand-in for the Censys Platform API endpoints used by the app's actions.
+
+Replays the recorded payloads in `loadtest/payloads`, rewritten to match the requested
+resource, with configurable latency, error rate and rate limiting. Run it with:
+
+    python -m loadtest.stub_server --port 8080 --latency 0.05 --rate-limit-rate 0.02
+
+and point an asset's `base_url` at http://127.0.0.1:8080.
+"""
+
+import argparse
+import copy
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+PAYLOADS_DIR = Path(__file__).parent / "payloads"
+
+_SINGLE_ROUTES = {
+    re.compile(r"^/v3/global/asset/host/([^/]+)$"): "host",
+    re.compile(r"^/v3/global/asset/certificate/([^/]+)$"): "certificate",
+    re.compile(r"^/v3/global/asset/webproperty/([^/]+)$"): "webproperty",
+}
+_BATCH_ROUTES = {
+    "/v3/global/asset/host": ("host", "host_ids"),
+    "/v3/global/asset/certificate": ("certificate", "certificate_ids"),
+    "/v3/global/asset/webproperty": ("webproperty", "webproperty_ids"),
+}
+_SEARCH_ROUTE = "/v3/global/search/query"
+
+
+@dataclass
+class StubConfig:
+    latency: float = 0.0
+    """Mean response latency in seconds. Each response waits between 0.5x and 1.5x."""
+    error_rate: float = 0.0
+    """Fraction of requests answered with a 500 error."""
+    rate_limit_rate: float = 0.0
+    """Fraction of requests answered with a 429 error and a `Retry-After` header."""
+    not_found: set[str] = field(default_factory=set)
+    """Resource IDs answered with a 404 error."""
+    search_pages: int = 1
+    """Number of search result pages served before `next_page_token` is left empty."""
+    seed: int | None = None
+
+
+class StubPlatformAPI:
+    """
+    Serves the stub API from a background thread, counting the requests and responses
+    by route and status code.
+    """
+
+    def __init__(
+        self,
+        config: StubConfig,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        payloads_dir: Path = PAYLOADS_DIR,
+    ) -> None:
+        self.config = config
+        self.payloads = {
+            path.stem: json.loads(path.read_text())
+            for path in payloads_dir.glob("*.json")
+        }
+        self.requests: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._random = random.Random(config.seed)  # noqa: S311
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubPlatformAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubPlatformAPI":
+        return self.start()
+
+    def __exit__(self, *_: object) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def respond(
+        self, method: str, path: str, body: dict
+    ) -> tuple[int, dict, dict[str, str]]:
+        """
+        Returns the status code, JSON body and extra headers for a request.
+        """
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        try:
+            (status, payload), headers = self._route(method, path, body)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        with self._lock:
+            self.statuses[status] += 1
+        return status, payload, headers
+
+    def _route(
+        self, method: str, path: str, body: dict
+    ) -> tuple[tuple[int, dict], dict[str, str]]:
+        with self._lock:
+            self.requests[f"{method} {path}"] += 1
+            roll = self._random.random()
+            latency = self.config.latency * (0.5 + self._random.random())
+
+        if latency:
+            time.sleep(latency)
+
+        if roll < self.config.rate_limit_rate:
+            return _error(429, "Too Many Requests"), {"Retry-After": "1"}
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            return _error(500, "Internal Server Error"), {}
+
+        if method == "GET":
+            for pattern, kind in _SINGLE_ROUTES.items():
+                if match := pattern.match(path):
+                    return self._resource(kind, unquote(match.group(1))), {}
+
+        if method == "POST" and path in _BATCH_ROUTES:
+            kind, ids_key = _BATCH_ROUTES[path]
+            results = [
+                self._resource(kind, resource_id)[1]["result"]
+                for resource_id in body.get(ids_key, [])
+                if resource_id not in self.config.not_found
+            ]
+            return (200, {"result": results}), {}
+
+        if method == "POST" and path == _SEARCH_ROUTE:
+            return self._search(body), {}
+
+        return _error(404, f"No stub route for {method} {path}"), {}
+
+    def _resource(self, kind: str, resource_id: str) -> tuple[int, dict]:
+        if resource_id in self.config.not_found:
+            return _error(404, f"{kind} {resource_id} not found")
+
+        payload = copy.deepcopy(self.payloads[kind])
+        resource = payload["result"]["resource"]
+
+        if kind == "host":
+            resource["ip"] = resource_id
+        elif kind == "certificate":
+            resource["fingerprint_sha256"] = resource_id
+        else:
+            hostname, _, port = resource_id.rpartition(":")
+            resource["hostname"] = hostname
+            resource["port"] = int(port) if port.isdigit() else resource["port"]
+
+        return 200, payload
+
+    def _search(self, body: dict) -> tuple[int, dict]:
+        payload = copy.deepcopy(self.payloads["search"])
+        page = int(body.get("page_token") or 0) + 1
+        result = payload["result"]
+        result["hits"] = result["hits"][: body.get("page_size") or None]
+        result["next_page_token"] = str(page) if page < self.config.search_pages else ""
+        return 200, payload
+
+
+def _error(status: int, detail: str) -> tuple[int, dict]:
+    return status, {"status": status, "title": detail, "detail": detail}
+
+
+def _make_handler(api: StubPlatformAPI) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            self._handle("GET")
+
+        def do_POST(self) -> None:
+            self._handle("POST")
+
+        def _handle(self, method: str) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw_body = self.rfile.read(length) if length else b""
+            try:
+                body = json.loads(raw_body) if raw_body else {}
+            except ValueError:
+                body = {}
+
+            status, payload, headers = api.respond(
+                method, urlsplit(self.path).path, body
+            )
+
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            # The SDK only accepts a success body with the media type it asked for
+            self.send_header(
+                "Content-Type",
+                self.headers.get("Accept", "application/json")
+                if status == 200
+                else "application/problem+json",
+            )
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *_: object) -> None:
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--not-found", action="append", default=[])
+    parser.add_argument("--search-pages", type=int, default=1)
+    parser.add_argument("--payloads", type=Path, default=PAYLOADS_DIR)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    api = StubPlatformAPI(
+        StubConfig(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            not_found=set(args.not_found),
+            search_pages=args.search_pages,
+            seed=args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+        payloads_dir=args.payloads,
+    )
+    print(f"Serving stub Platform API on {api.base_url}")
+    try:
+        api.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(dict(api.statuses))
+
+
+if __name__ == "__main__":
+    main()
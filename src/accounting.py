@@ -0,0 +1,125 @@
+import threading
+from dataclasses import dataclass
+
+import httpx
+
+from soar_sdk.logging import getLogger
+
+from .config import Asset
+
+logger = getLogger()
+
+# The Platform API reports the credits consumed by a request in a response header
+# when the account is metered. Responses without it are counted as zero credits.
+CREDITS_USED_HEADER = "x-credits-used"
+
+# Marks requests whose response body is consumed incrementally by the caller. Their
+# bytes are recorded with `UsageMeter.record_bytes` once the body has been read.
+STREAMING_EXTENSION = "censys_streaming"
+
+
+class BudgetExceededError(Exception):
+    """
+    Raised before an outbound request would exceed the run's request or credit budget.
+    """
+
+
+@dataclass
+class ApiUsage:
+    requests: int = 0
+    bytes_received: int = 0
+    cache_hits: int = 0
+    credits_used: float = 0.0
+
+
+class UsageMeter:
+    """
+    Counts the requests, response bytes, cache hits and credits used by a single action
+    run, and enforces the run's request and credit budgets. A budget of 0 is unlimited.
+    """
+
+    def __init__(self, request_budget: int = 0, credit_budget: float = 0) -> None:
+        self.usage = ApiUsage()
+        self.request_budget = request_budget
+        self.credit_budget = credit_budget
+        self.budget_exhausted = False
+        # Actions that fan out share one meter between worker threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_run(
+        cls, asset: Asset, request_budget: int = 0, credit_budget: float = 0
+    ) -> "UsageMeter":
+        """
+        Creates a meter for one action run, honoring the tighter of the asset-wide and
+        the action-level budgets.
+        """
+        return cls(
+            request_budget=_tightest(asset.request_budget, request_budget),
+            credit_budget=_tightest(asset.credit_budget, credit_budget),
+        )
+
+    def check_budget(self) -> None:
+        if self.request_budget and self.usage.requests >= self.request_budget:
+            self.budget_exhausted = True
+            raise BudgetExceededError(
+                f"Request budget of {self.request_budget:,} exhausted"
+            )
+
+        if self.credit_budget and self.usage.credits_used >= self.credit_budget:
+            self.budget_exhausted = True
+            raise BudgetExceededError(
+                f"Credit budget of {self.credit_budget:,} exhausted"
+            )
+
+    def record_cache_hit(self) -> None:
+        with self._lock:
+            self.usage.cache_hits += 1
+
+    def record_bytes(self, count: int) -> None:
+        with self._lock:
+            self.usage.bytes_received += count
+
+    def event_hooks(self) -> dict:
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    def summary_fields(self) -> dict:
+        """
+        The usage totals in the shape expected by `CensysActionSummary`.
+        """
+        return {
+            "requests": self.usage.requests,
+            "bytes_received": self.usage.bytes_received,
+            "cache_hits": self.usage.cache_hits,
+            "credits_used": self.usage.credits_used,
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+    def _on_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.check_budget()
+            self.usage.requests += 1
+            request_number = self.usage.requests
+        logger.debug(f"Sending request #{request_number}: {request.url.path}")
+
+    def _on_response(self, response: httpx.Response) -> None:
+        streaming = response.request.extensions.get(STREAMING_EXTENSION, False)
+        if not streaming:
+            response.read()
+        credits_used = response.headers.get(CREDITS_USED_HEADER)
+
+        with self._lock:
+            if not streaming:
+                self.usage.bytes_received += len(response.content)
+            if credits_used is None:
+                return
+
+            try:
+                self.usage.credits_used += float(credits_used)
+            except ValueError:
+                logger.warning(f"Ignoring malformed credits header: {credits_used!r}")
+
+
+def _tightest(*budgets: float) -> float:
+    limits = [b for b in budgets if b and b > 0]
+    return min(limits) if limits else 0
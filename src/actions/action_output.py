@@ -1,25 +1,62 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import importlib.metadata
 import itertools
+import json
+import os
 import types
 from enum import Enum
-from typing import Any, TypeAliasType, Union, get_args, get_origin
-from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Self, TypeAliasType, Union, get_args, get_origin
+from collections.abc import Iterable, Iterator
 
 from pydantic import BaseModel
 
+from soar_sdk.abstract import SOARClient
 from soar_sdk.logging import getLogger
 from soar_sdk.action_results import (
     ActionOutput,
+    ActionResult,
     OutputFieldSpecification,
 )
 from soar_sdk.field_utils import parse_json_schema_extra
 from soar_sdk.meta.datatypes import as_datatype
+from soar_sdk.params import Params
+
+from ..accounting import UsageMeter
+from ..serialization import to_jsonable
 
 logger = getLogger()
 
+# When set (as `build_package.sh` does), generated output specs are cached in this
+# directory and reused by later builds until the SDK versions or output classes change
+OUTPUT_SPEC_CACHE_ENV = "CENSYS_OUTPUT_SPEC_CACHE"
+
 
 class CensysActionOutput(ActionOutput):
+    @classmethod
+    def trusted(cls, validate: bool = False, **data: Any) -> Self:
+        """
+        Builds an output from values that were already validated, such as models
+        returned by the Censys SDK, without validating or copying them again. With
+        `validate` (the asset's `validate_outputs` debug switch), the whole output tree
+        is dumped and validated from scratch instead, as the view handlers will do.
+        """
+        output = cls.model_construct(**data)
+        if validate:
+            return cls.model_validate(output.to_result_data())
+        return output
+
+    def to_result_data(self) -> dict[str, Any]:
+        """
+        Dumps the output as it is stored in the action result, like
+        `model_dump(by_alias=True)` but without running the Censys SDK's per-model
+        serializers. Unset fields, and optional fields that are None, are omitted.
+        """
+        return to_jsonable(self)
+
     @classmethod
     def _to_json_schema(
         cls,
@@ -36,9 +73,125 @@ class CensysActionOutput(ActionOutput):
         if column_order_counter is None:
             column_order_counter = itertools.count()
 
-        yield from _model_to_json_schema_impl(
-            cls, cls, parent_datapath, column_order_counter
+        cache_dir = os.environ.get(OUTPUT_SPEC_CACHE_ENV)
+        if not cache_dir:
+            yield from _model_to_json_schema_impl(
+                cls, cls, parent_datapath, column_order_counter
+            )
+            return
+
+        yield from _cached_output_specs(
+            cls, Path(cache_dir), parent_datapath, column_order_counter
+        )
+
+
+class CensysActionSummary(ActionOutput):
+    """
+    Fields shared by every action summary, reporting the API usage of the run.
+    """
+
+    requests: int = 0
+    bytes_received: int = 0
+    cache_hits: int = 0
+    credits_used: float = 0.0
+    budget_exhausted: bool = False
+
+
+def failed_result(message: str, params: Params, meter: UsageMeter) -> ActionResult:
+    """
+    Builds a failed result that still reports the run's API usage. SOAR drops the
+    summary of actions that raise `ActionFailure`, so failures served from a cache
+    are returned this way to keep their cache hits visible.
+    """
+    result = ActionResult(False, message, dict(params))
+    result.set_summary(
+        CensysActionSummary(**meter.summary_fields()).model_dump(by_alias=True)
+    )
+    return result
+
+
+def success_results(
+    outputs: Iterable[CensysActionOutput], params: Params, soar: SOARClient
+) -> list[ActionResult]:
+    """
+    Builds the action results for the outputs of a successful run, with the summary
+    and message already set on `soar`. SOAR would otherwise dump returned outputs with
+    `model_dump`, which is slow for large SDK models, so actions return these instead.
+    """
+    summary = soar.get_summary()
+
+    def new_result() -> ActionResult:
+        result = ActionResult(True, soar.get_message(), dict(params))
+        if summary is not None:
+            result.set_summary(summary.model_dump(by_alias=True))
+        return result
+
+    results: list[ActionResult] = []
+    for output in outputs:
+        result = new_result()
+        result.add_data(output.to_result_data())
+        results.append(result)
+
+    # Like SOAR, runs without any outputs still report their summary and message
+    return results or [new_result()]
+
+
+def _cached_output_specs(
+    cls,
+    cache_dir: Path,
+    parent_datapath: str,
+    column_order_counter: itertools.count,
+) -> Iterator[OutputFieldSpecification]:
+    """
+    Loads the output specs for `cls` from the build cache, generating and storing them
+    on a miss. Specs are cached with column orders starting at 0 and renumbered from
+    the caller's counter, so that they can be reused in any position.
+    """
+    key = hashlib.sha256(
+        f"{_output_definitions_digest()}|{cls.__module__}.{cls.__qualname__}|{parent_datapath}".encode()
+    ).hexdigest()
+    cache_path = cache_dir / f"{key}.json"
+
+    try:
+        specs = json.loads(cache_path.read_text())
+        logger.debug(f"Using cached output specs for {cls.__name__}")
+    except (OSError, ValueError):
+        specs = list(
+            _model_to_json_schema_impl(cls, cls, parent_datapath, itertools.count())
         )
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(specs))
+            tmp_path.replace(cache_path)
+        except OSError as err:
+            logger.warning(f"Failed to cache output specs for {cls.__name__}: {err}")
+
+    for spec in specs:
+        if "column_order" in spec:
+            spec["column_order"] = next(column_order_counter)
+        yield spec
+
+
+@functools.cache
+def _output_definitions_digest() -> str:
+    """
+    Fingerprints everything the generated output specs depend on: the installed SDK
+    versions and the source of the modules defining the action outputs.
+    """
+    digest = hashlib.sha256()
+    for dist in ("censys-platform", "splunk-soar-sdk"):
+        try:
+            version = importlib.metadata.version(dist)
+        except importlib.metadata.PackageNotFoundError:
+            version = "unknown"
+        digest.update(f"{dist}=={version}\n".encode())
+
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
 
 
 def _model_to_json_schema_impl(
@@ -0,0 +1,233 @@
+import itertools
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from censys_platform import SDK, models
+from pydantic import BaseModel, Field
+from soar_sdk.logging import getLogger
+
+from ..accounting import BudgetExceededError
+from ..cache import CredentialCache
+from ..inputs import normalize_ip
+
+logger = getLogger()
+
+BATCH_SIZE = 100
+MAX_CONCURRENCY = 16
+
+# Fetches the resources with the given IDs, optionally at a point in time
+Fetcher = Callable[[SDK, tuple[str, ...], str | None], dict[str, BaseModel]]
+
+# How each resource type is named in error messages
+RESOURCE_NAMES = {"host": "host", "cert": "cert", "web": "web property"}
+
+
+def concurrency_field(default: int, description: str) -> Any:
+    """
+    A `concurrency` action parameter, bounded by the number of worker threads an
+    action may start.
+    """
+    return Field(
+        default=default,
+        ge=1,
+        le=MAX_CONCURRENCY,
+        required=False,
+        description=description,
+    )
+
+
+def run_concurrently[T, R](
+    fn: Callable[[T], R], items: Iterable[T], concurrency: int
+) -> list[tuple[T, R | None, BaseException | None]]:
+    """
+    Calls `fn` for each item on up to `concurrency` threads, and returns every item with
+    its result or the exception it raised, in the order the items were given.
+    """
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(concurrency, MAX_CONCURRENCY))
+    ) as executor:
+        futures = [(item, executor.submit(fn, item)) for item in items]
+
+    return [(item, *_outcome(future)) for item, future in futures]
+
+
+def _outcome[R](future: Future[R]) -> tuple[R | None, BaseException | None]:
+    if (err := future.exception()) is not None:
+        return None, err
+    return future.result(), None
+
+
+def describe_error(kind: str, err: BaseException) -> str:
+    if isinstance(err, BudgetExceededError):
+        return f"Not retrieved: {err}"
+    if isinstance(err, models.SDKBaseError):
+        return f"Failed to retrieve {kind} with status code: {err.status_code}"
+    return f"Failed to retrieve {kind} with generic error"
+
+
+class BatchLookups:
+    """
+    Fetches hosts, certificates and web properties by ID through the API's batch
+    endpoints, falling back to one lookup per ID when the credentials may not use them
+    (403). What was learned is kept in the credential cache, so that later runs go
+    straight to the supported endpoints.
+    """
+
+    def __init__(self, credentials: CredentialCache) -> None:
+        self.credentials = credentials
+        # None until the batch endpoints have been tried with these credentials
+        self.available = credentials.get().batch_lookups
+
+    def batches(
+        self, ids: Iterable[str], size: int = BATCH_SIZE
+    ) -> list[tuple[str, ...]]:
+        """
+        Splits IDs into batches, or into single IDs when batch lookups are known to be
+        unavailable, so that single lookups are still spread across workers.
+        """
+        if self.available is False:
+            size = 1
+        return list(itertools.batched(ids, size, strict=False))
+
+    def fetch(
+        self,
+        sdk: SDK,
+        resource_type: str,
+        ids: tuple[str, ...],
+        at_time: str | None = None,
+    ) -> dict[str, BaseModel]:
+        """
+        Returns the found resources of a batch, keyed by their normalized ID. IDs that
+        were not found are left out.
+        """
+        fetch_batch, fetch_each = FETCHERS[resource_type]
+        if self.available is False:
+            return fetch_each(sdk, ids, at_time)
+
+        try:
+            found = fetch_batch(sdk, ids, at_time)
+        except models.SDKBaseError as err:
+            if err.status_code != 403:
+                raise
+            # The batch endpoints are not available to these credentials
+            logger.info("Batch lookups are not available, retrying one at a time")
+            if self.available is not False:
+                self.available = False
+                self.credentials.record_batch_lookups(False)
+            return fetch_each(sdk, ids, at_time)
+
+        if self.available is None:
+            self.available = True
+            self.credentials.record_batch_lookups(True)
+        return found
+
+
+def _host_key(host: models.Host) -> str:
+    return normalize_ip(host.ip)
+
+
+def _cert_key(cert: models.Certificate) -> str:
+    return cert.fingerprint_sha256.lower()
+
+
+def _web_key(web: models.Webproperty) -> str:
+    return f"{web.hostname}:{web.port}".lower()
+
+
+def _fetch_hosts(
+    sdk: SDK, ids: tuple[str, ...], at_time: str | None
+) -> dict[str, BaseModel]:
+    res = sdk.global_data.get_hosts(
+        asset_host_list_input_body=models.AssetHostListInputBody(
+            host_ids=list(ids), at_time=at_time
+        )
+    )
+    # Unknown hosts come back without any services
+    return {
+        _host_key(a.resource): a.resource
+        for a in res.result.result or []
+        if a.resource.services
+    }
+
+
+def _fetch_each_host(
+    sdk: SDK, ids: tuple[str, ...], at_time: str | None
+) -> dict[str, BaseModel]:
+    return _fetch_each(
+        ids,
+        lambda i: sdk.global_data.get_host(host_id=i, at_time=at_time),
+        _host_key,
+        lambda host: bool(host.services),
+    )
+
+
+def _fetch_certs(
+    sdk: SDK, ids: tuple[str, ...], _at_time: str | None
+) -> dict[str, BaseModel]:
+    # Certificates have no history, so `at_time` does not apply
+    res = sdk.global_data.get_certificates(
+        asset_certificate_list_input_body=models.AssetCertificateListInputBody(
+            certificate_ids=list(ids)
+        )
+    )
+    return {_cert_key(a.resource): a.resource for a in res.result.result or []}
+
+
+def _fetch_each_cert(
+    sdk: SDK, ids: tuple[str, ...], _at_time: str | None
+) -> dict[str, BaseModel]:
+    return _fetch_each(
+        ids,
+        lambda i: sdk.global_data.get_certificate(certificate_id=i),
+        _cert_key,
+    )
+
+
+def _fetch_web_properties(
+    sdk: SDK, ids: tuple[str, ...], at_time: str | None
+) -> dict[str, BaseModel]:
+    res = sdk.global_data.get_web_properties(
+        asset_webproperty_list_input_body=models.AssetWebpropertyListInputBody(
+            webproperty_ids=list(ids), at_time=at_time
+        )
+    )
+    return {_web_key(a.resource): a.resource for a in res.result.result or []}
+
+
+def _fetch_each_web_property(
+    sdk: SDK, ids: tuple[str, ...], at_time: str | None
+) -> dict[str, BaseModel]:
+    return _fetch_each(
+        ids,
+        lambda i: sdk.global_data.get_web_property(webproperty_id=i, at_time=at_time),
+        _web_key,
+    )
+
+
+def _fetch_each(
+    ids: tuple[str, ...],
+    get: Callable[[str], Any],
+    key: Callable[[Any], str],
+    is_found: Callable[[Any], bool] = lambda _: True,
+) -> dict[str, BaseModel]:
+    found: dict[str, BaseModel] = {}
+    for resource_id in ids:
+        try:
+            resource = get(resource_id).result.result.resource
+        except models.SDKBaseError as err:
+            if err.status_code == 404:
+                continue
+            raise
+        if is_found(resource):
+            found[key(resource)] = resource
+
+    return found
+
+
+# The batch and the single lookup fetchers of each resource type
+FETCHERS: dict[str, tuple[Fetcher, Fetcher]] = {
+    "host": (_fetch_hosts, _fetch_each_host),
+    "cert": (_fetch_certs, _fetch_each_cert),
+    "web": (_fetch_web_properties, _fetch_each_web_property),
+}
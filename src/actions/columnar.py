@@ -0,0 +1,153 @@
+from collections.abc import Iterable
+
+from censys_platform import models
+from censys_platform.types import UNSET
+from soar_sdk.action_results import ActionOutput
+
+# CenQL field prefixes, mapped to the search hit attribute holding that resource type
+RESOURCE_TYPES = {
+    "host": "host_v1",
+    "web": "webproperty_v1",
+    "cert": "certificate_v1",
+}
+
+DEFAULT_COLUMNS = (
+    "host.ip",
+    "host.autonomous_system.asn",
+    "host.autonomous_system.name",
+    "host.location.country",
+    "host.service_count",
+    "web.hostname",
+    "web.port",
+    "web.scan_time",
+    "cert.fingerprint_sha256",
+    "cert.parsed.subject_dn",
+    "cert.parsed.issuer_dn",
+)
+
+# Columns are dictionary-encoded when at most this fraction of their values are distinct
+DICTIONARY_ENCODING_RATIO = 0.5
+
+
+class SearchColumn(ActionOutput):
+    """
+    A single column of values. Dictionary-encoded columns leave `values` empty and
+    store an index into `dictionary` per row in `codes` instead, with -1 for null.
+    """
+
+    name: str
+    values: list[str | None]
+    codes: list[int]
+    dictionary: list[str]
+
+
+class SearchResourceColumns(ActionOutput):
+    resource_type: str
+    row_count: int
+    columns: list[SearchColumn]
+
+
+def parse_columns(value: str) -> tuple[str, ...]:
+    """
+    Parses a comma-separated list of CenQL field names, such as `host.ip,web.hostname`,
+    into compact output columns. Returns the default columns when none were given.
+    """
+    columns = tuple(c.strip() for c in value.split(",") if c.strip())
+    if not columns:
+        return DEFAULT_COLUMNS
+
+    for column in columns:
+        resource_type, _, path = column.partition(".")
+        if resource_type not in RESOURCE_TYPES or not path:
+            raise ValueError(
+                f"Column '{column}' must be a field of one of: {', '.join(RESOURCE_TYPES)}"
+            )
+
+    return columns
+
+
+class ColumnarHitsBuilder:
+    """
+    Accumulates search hits into parallel columns per resource type, without keeping
+    the hits themselves.
+    """
+
+    def __init__(self, columns: Iterable[str]) -> None:
+        self._paths: dict[str, list[tuple[str, list[str]]]] = {}
+        for column in columns:
+            resource_type, _, path = column.partition(".")
+            self._paths.setdefault(resource_type, []).append((column, path.split(".")))
+
+        self._rows: dict[str, list[list[str | None]]] = {
+            resource_type: [[] for _ in paths]
+            for resource_type, paths in self._paths.items()
+        }
+
+    def add_hits(self, hits: Iterable[models.SearchQueryHit]) -> None:
+        for hit in hits:
+            for resource_type, paths in self._paths.items():
+                asset = getattr(hit, RESOURCE_TYPES[resource_type], None)
+                resource = getattr(asset, "resource", None)
+                if resource is None:
+                    continue
+
+                for column, (_, parts) in zip(
+                    self._rows[resource_type], paths, strict=True
+                ):
+                    column.append(_column_value(resource, parts))
+
+    def build(self) -> list[SearchResourceColumns]:
+        return [
+            SearchResourceColumns(
+                resource_type=resource_type,
+                row_count=len(self._rows[resource_type][0]),
+                columns=[
+                    _encode_column(name, values)
+                    for (name, _), values in zip(
+                        paths, self._rows[resource_type], strict=True
+                    )
+                ],
+            )
+            for resource_type, paths in self._paths.items()
+            if self._rows[resource_type][0]
+        ]
+
+
+def _column_value(resource: object, parts: list[str]) -> str | None:
+    values: list[object] = [resource]
+    for attr in parts:
+        next_values: list[object] = []
+        for value in values:
+            child = getattr(value, attr, None)
+            if isinstance(child, list):
+                next_values.extend(c for c in child if c is not None)
+            elif child is not None and child != UNSET:
+                next_values.append(child)
+        values = next_values
+
+    if not values:
+        return None
+
+    return ", ".join(_format_value(v) for v in values)
+
+
+def _format_value(value: object) -> str:
+    enum_value = getattr(value, "value", None)
+    if isinstance(enum_value, str | int):
+        return str(enum_value)
+    return str(value)
+
+
+def _encode_column(name: str, values: list[str | None]) -> SearchColumn:
+    distinct = {v for v in values if v is not None}
+    if len(distinct) > len(values) * DICTIONARY_ENCODING_RATIO:
+        return SearchColumn(name=name, values=values, codes=[], dictionary=[])
+
+    dictionary = sorted(distinct)
+    index = {v: i for i, v in enumerate(dictionary)}
+    return SearchColumn(
+        name=name,
+        values=[],
+        codes=[index[v] if v is not None else -1 for v in values],
+        dictionary=dictionary,
+    )
@@ -1,27 +1,38 @@
 from datetime import datetime, UTC
 
 from censys_platform import models
-from pydantic import Field
 from soar_sdk.abstract import SOARClient
-from soar_sdk.action_results import ActionOutput
+from soar_sdk.action_results import ActionResult
 from soar_sdk.exceptions import ActionFailure
 from soar_sdk.logging import getLogger
-from soar_sdk.params import Params
+from soar_sdk.params import Param
 
+from ..accounting import UsageMeter
+from ..cache import NegativeCache, ResponseCache
 from ..config import Asset
+from ..inputs import normalize_fingerprint
 from ..utils import create_censys_sdk
-from .action_output import CensysActionOutput
-from .utils import extract_cert_fields, get_cert_display_name
+from .action_output import (
+    CensysActionOutput,
+    CensysActionSummary,
+    failed_result,
+    success_results,
+)
+from .params import BudgetParams
+from .projection import apply_projection, compile_projection
+from .utils import get_cert_display_name, memoize_cert_fields
 
 logger = getLogger()
 
 
-class GetCertActionParams(Params):
-    fingerprint_sha256: str = Field(
-        min_length=64,
-        max_length=64,
-        pattern=r"[\da-zA-Z]{64}",
-        description="Hex SHA256 fingerprint for the certificate to lookup",
+class GetCertActionParams(BudgetParams):
+    fingerprint_sha256: str = Param(
+        description="Hex SHA256 fingerprint for the certificate to lookup, optionally with colon-separated bytes"
+    )
+    fields: str = Param(
+        default="",
+        required=False,
+        description="Comma-separated list of certificate fields to keep in the output, such as 'parsed.subject_dn,parsed.validity_period,names'. If unspecified, the whole certificate is returned.",
     )
 
 
@@ -30,35 +41,86 @@ class GetCertActionOutput(CensysActionOutput):
     cert: models.Certificate
 
 
-class GetCertActionSummary(ActionOutput):
+class GetCertActionSummary(CensysActionSummary):
     display_name: str
     fingerprint_sha256: str
 
 
 def lookup_cert(
     params: GetCertActionParams, asset: Asset, soar: SOARClient[GetCertActionSummary]
-) -> GetCertActionOutput:
+):
     """
     Retrieves a certificate by its hex SHA256 fingerprint
     """
-    logger.info(f"Loading cert with fingerprint {params.fingerprint_sha256}")
+    try:
+        fingerprint = normalize_fingerprint(params.fingerprint_sha256)
+    except ValueError:
+        return ActionResult(
+            False,
+            "Please provide a valid hex SHA256 value in the 'fingerprint_sha256' action parameter",
+            dict(params),
+        )
+
+    try:
+        projection = compile_projection(
+            models.Certificate, params.fields, ("fingerprint_sha256",)
+        )
+    except ValueError as err:
+        return ActionResult(
+            False,
+            f"Please provide valid certificate fields in the 'fields' action parameter: {err}",
+            dict(params),
+        )
+
+    logger.info(f"Loading cert with fingerprint {fingerprint}")
     data: models.Certificate | None = None
+    meter = UsageMeter.for_run(asset, params.request_budget, params.credit_budget)
+    negative_cache = NegativeCache.for_asset(asset)
+    response_cache = ResponseCache.for_asset(asset)
+    cache_key = fingerprint
+
+    if (cached_status := negative_cache.get("cert", cache_key)) is not None:
+        logger.info(
+            f"Skipping cert lookup of {cache_key}: cached {cached_status} result"
+        )
+        meter.record_cache_hit()
+        return failed_result(
+            f"Failed to retrieve cert with status code: {cached_status} (cached result)",
+            params,
+            meter,
+        )
 
-    with create_censys_sdk(asset) as sdk:
-        try:
-            res = sdk.global_data.get_certificate(
-                certificate_id=params.fingerprint_sha256
-            )
-            data = res.result.result.resource
-            logger.debug("Successfully retrieved cert")
-        except models.SDKBaseError as err:
-            logger.error(err)
-            raise ActionFailure(
-                f"Failed to retrieve cert with status code: {err.status_code}"
-            ) from err
-        except Exception as err:
-            logger.error(err)
-            raise ActionFailure("Failed to retrieve cert with generic error") from err
+    data = response_cache.get("cert", cache_key, models.Certificate)
+    if data is not None:
+        logger.info(f"Serving cert {cache_key} from the response cache")
+        meter.record_cache_hit()
+
+    if data is None:
+        with create_censys_sdk(asset, meter) as sdk:
+            try:
+                res = sdk.global_data.get_certificate(certificate_id=fingerprint)
+                data = res.result.result.resource
+                logger.debug("Successfully retrieved cert")
+                response_cache.put("cert", cache_key, data)
+            except models.SDKBaseError as err:
+                logger.error(err)
+                negative_cache.put("cert", cache_key, err.status_code)
+                raise ActionFailure(
+                    f"Failed to retrieve cert with status code: {err.status_code}"
+                ) from err
+            except Exception as err:
+                logger.error(err)
+                raise ActionFailure(
+                    "Failed to retrieve cert with generic error"
+                ) from err
+
+    try:
+        cert = apply_projection(data, projection)
+    except Exception as err:
+        logger.error(err)
+        raise ActionFailure(
+            "Failed to select the requested certificate fields"
+        ) from err
 
     display_name = get_cert_display_name(data)
     validity_period_message = get_cert_validity_message(data)
@@ -68,16 +130,19 @@ def lookup_cert(
         GetCertActionSummary(
             display_name=display_name,
             fingerprint_sha256=data.fingerprint_sha256,
+            **meter.summary_fields(),
         )
     )
     soar.set_message(
         f"Cert '{display_name}': {self_signed_message} and {validity_period_message}."
     )
 
-    return GetCertActionOutput(
-        cert=data,
+    output = GetCertActionOutput.trusted(
+        validate=asset.validate_outputs,
+        cert=cert,
         display_name=display_name,
     )
+    return success_results([output], params, soar)
 
 
 def get_cert_validity_message(cert: models.Certificate) -> str:
@@ -124,7 +189,12 @@ def get_cert_self_signed_message(cert: models.Certificate) -> str:
 
 
 def lookup_cert_view_handler(all_outputs: list[GetCertActionOutput]) -> dict:
+    certs: dict[str, dict] = {}
+    for output in all_outputs:
+        memoize_cert_fields(output.cert, certs)
+
+    # Outputs of the same certificate are shown, and counted, once
     return {
-        "results": [extract_cert_fields(output.cert) for output in all_outputs],
-        "total_count": len(all_outputs),
+        "results": list(certs.values()),
+        "total_count": len(certs),
     }
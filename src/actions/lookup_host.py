@@ -1,24 +1,44 @@
+import heapq
+
 from censys_platform import models
 from soar_sdk.abstract import SOARClient
-from soar_sdk.action_results import ActionOutput, ActionResult
+from soar_sdk.action_results import ActionResult
 from soar_sdk.exceptions import ActionFailure
 from soar_sdk.logging import getLogger
-from soar_sdk.params import Param, Params
+from soar_sdk.models.view import ViewContext
+from soar_sdk.params import Param
 
+from ..accounting import UsageMeter
+from ..cache import NegativeCache, ResponseCache
 from ..config import Asset
-from ..utils import create_censys_sdk, get_attr_path, is_valid_at_time, is_valid_ip
-from .action_output import CensysActionOutput
+from ..inputs import normalize_at_time, normalize_ip
+from ..streaming import stream_host
+from ..utils import create_censys_sdk, get_attr_path
+from .action_output import (
+    CensysActionOutput,
+    CensysActionSummary,
+    failed_result,
+    success_results,
+)
+from .params import BudgetParams
+from .projection import apply_projection, compile_projection
+from .utils import count_by, get_show_more_link, get_view_row_limit
 
 logger = getLogger()
 
 
-class GetHostActionParams(Params):
+class GetHostActionParams(BudgetParams):
     ip: str = Param(description="IPv4/IPv6 address for the host to lookup")
     at_time: str = Param(
         default="",
         required=False,
         description="The historical timestamp to retrieve host data for. If unspecified, we will retrieve the latest data.",
     )
+    fields: str = Param(
+        default="",
+        required=False,
+        description="Comma-separated list of host fields to keep in the output, such as 'services.port,services.protocol,dns,location'. If unspecified, the whole host is returned.",
+    )
 
 
 class GetHostActionOutput(CensysActionOutput):
@@ -27,7 +47,7 @@ class GetHostActionOutput(CensysActionOutput):
     scan_time: str
 
 
-class GetHostActionSummary(ActionOutput):
+class GetHostActionSummary(CensysActionSummary):
     ip: str
     scan_time: str
     ports: list[int]
@@ -36,45 +56,91 @@ class GetHostActionSummary(ActionOutput):
 
 def lookup_host(
     params: GetHostActionParams, asset: Asset, soar: SOARClient[GetHostActionSummary]
-) -> GetHostActionOutput:
+):
     """
     Retrieves a host by its IP address
     """
-    if not is_valid_ip(params.ip):
+    try:
+        ip = normalize_ip(params.ip)
+    except ValueError:
         return ActionResult(
             False,
             "Please provide a valid IPv4/IPv6 value in the 'ip' action parameter",
             dict(params),
         )
 
-    if params.at_time and not is_valid_at_time(params.at_time):
+    at_time: str | None = None
+    if params.at_time:
+        try:
+            at_time = normalize_at_time(params.at_time)
+        except ValueError:
+            return ActionResult(
+                False,
+                "Please provide a valid ISO 8601 timestamp in the 'at_time' action parameter, or leave it unset",
+                dict(params),
+            )
+
+    try:
+        projection = compile_projection(models.Host, params.fields, ("ip",))
+    except ValueError as err:
         return ActionResult(
             False,
-            "Please provide a valid ISO 8601 timestamp in the 'at_time' action parameter, or leave it unset",
+            f"Please provide valid host fields in the 'fields' action parameter: {err}",
             dict(params),
         )
 
-    logger.info(
-        f"Loading host with IP {params.ip} (at_time: {params.at_time if params.at_time else 'unspecified'})"
-    )
+    logger.info(f"Loading host with IP {ip} (at_time: {at_time or 'unspecified'})")
     data: models.Host | None = None
+    meter = UsageMeter.for_run(asset, params.request_budget, params.credit_budget)
+    negative_cache = NegativeCache.for_asset(asset)
+    response_cache = ResponseCache.for_asset(asset)
+    cache_key = f"{ip}@{at_time or ''}"
+
+    if (cached_status := negative_cache.get("host", cache_key)) is not None:
+        logger.info(
+            f"Skipping host lookup of {cache_key}: cached {cached_status} result"
+        )
+        meter.record_cache_hit()
+        return failed_result(
+            f"Failed to retrieve host with status code: {cached_status} (cached result)",
+            params,
+            meter,
+        )
 
-    with create_censys_sdk(asset) as sdk:
-        try:
-            res = sdk.global_data.get_host(
-                host_id=params.ip,
-                at_time=str(params.at_time) if params.at_time else None,
-            )
-            data = res.result.result.resource
-            logger.debug("Successfully retrieved host")
-        except models.SDKBaseError as err:
-            logger.error(err)
-            raise ActionFailure(
-                f"Failed to retrieve host with status code: {err.status_code}"
-            ) from err
-        except Exception as err:
-            logger.error(err)
-            raise ActionFailure("Failed to retrieve host with generic error") from err
+    if at_time is None:
+        data = response_cache.get("host", ip, models.Host)
+        if data is not None:
+            logger.info(f"Serving host {ip} from the response cache")
+            meter.record_cache_hit()
+
+    if data is None:
+        with create_censys_sdk(asset, meter) as sdk:
+            try:
+                if asset.stream_responses:
+                    data = stream_host(sdk, meter, ip, at_time)
+                else:
+                    res = sdk.global_data.get_host(host_id=ip, at_time=at_time)
+                    data = res.result.result.resource
+                logger.debug("Successfully retrieved host")
+                if at_time is None:
+                    response_cache.put("host", ip, data)
+            except models.SDKBaseError as err:
+                logger.error(err)
+                negative_cache.put("host", cache_key, err.status_code)
+                raise ActionFailure(
+                    f"Failed to retrieve host with status code: {err.status_code}"
+                ) from err
+            except Exception as err:
+                logger.error(err)
+                raise ActionFailure(
+                    "Failed to retrieve host with generic error"
+                ) from err
+
+    try:
+        host = apply_projection(data, projection)
+    except Exception as err:
+        logger.error(err)
+        raise ActionFailure("Failed to select the requested host fields") from err
 
     latest_scan = get_last_scanned_at(data)
 
@@ -86,6 +152,7 @@ def lookup_host(
             ports=list(set(getattr(s, "port", None) or 0 for s in data.services)),
             scan_time=latest_scan,
             service_count=getattr(data, "service_count", None) or len(data.services),
+            **meter.summary_fields(),
         )
     )
 
@@ -98,16 +165,28 @@ def lookup_host(
             f"Host '{data.ip}' has {data.service_count:,} visible service(s), last scanned at {latest_scan}"
         )
 
-    return GetHostActionOutput(
-        scan_time=latest_scan, is_truncated_host=is_truncated_host, host=data
+    output = GetHostActionOutput.trusted(
+        validate=asset.validate_outputs,
+        scan_time=latest_scan,
+        is_truncated_host=is_truncated_host,
+        host=host,
     )
+    return success_results([output], params, soar)
 
 
 def get_last_scanned_at(host: models.Host) -> str:
     return max(s.scan_time for s in host.services)
 
 
-def lookup_host_view_handler(all_outputs: list[GetHostActionOutput]) -> dict:
+def lookup_host_view_handler(
+    context: ViewContext, all_outputs: list[GetHostActionOutput]
+) -> dict:
+    limit = get_view_row_limit(context)
+    max_service_total = max(
+        (len(get_attr_path(o, "host.services", None) or []) for o in all_outputs),
+        default=0,
+    )
+
     return {
         "results": [
             {
@@ -118,7 +197,11 @@ def lookup_host_view_handler(all_outputs: list[GetHostActionOutput]) -> dict:
                 "whois_name": get_attr_path(output, "host.whois.network.name", "N/A"),
                 "whois_cidr": get_attr_path(output, "host.whois.network.cidrs", []),
                 "asn": render_asn(output),
-                "services": render_services(output),
+                "services": render_services(output, limit),
+                "service_total": len(
+                    get_attr_path(output, "host.services", None) or []
+                ),
+                "service_groups": render_service_groups(output),
                 "labels": render_labels(output),
                 "threats": render_threats(output),
                 "location": render_location(output),
@@ -126,6 +209,7 @@ def lookup_host_view_handler(all_outputs: list[GetHostActionOutput]) -> dict:
             for output in all_outputs
         ],
         "total_count": len(all_outputs),
+        "show_more_link": get_show_more_link(context, limit, max_service_total),
     }
 
 
@@ -139,17 +223,40 @@ def render_asn(output: GetHostActionOutput) -> str:
     return f"{name} ({asn})"
 
 
-def render_services(output: GetHostActionOutput) -> list[dict]:
+def render_services(
+    output: GetHostActionOutput, limit: int | None = None
+) -> list[dict]:
+    """
+    Renders the host's services ordered by port. When a limit is given, only the first
+    `limit` services are rendered.
+    """
+    services = get_attr_path(output, "host.services", None) or []
+    if limit is not None:
+        services = heapq.nsmallest(
+            limit, services, key=lambda s: (s.port or 0, s.protocol or "")
+        )
+    else:
+        services = sorted(services, key=lambda s: (s.port or 0, s.protocol or ""))
+
     return [
         {
             "port": svc.port,
             "protocol": svc.protocol,
-            "transport_protocol": svc.transport_protocol.value.upper(),
+            "transport_protocol": svc.transport_protocol.value.upper()
+            if svc.transport_protocol
+            else None,
         }
-        for svc in get_attr_path(output, "host.services", [])
+        for svc in services
     ]
 
 
+def render_service_groups(output: GetHostActionOutput) -> list[dict]:
+    return count_by(
+        get_attr_path(output, "host.services", None) or [],
+        lambda s: s.protocol,
+    )
+
+
 def render_labels(output: GetHostActionOutput) -> list[str]:
     labels = set[str]()
 
@@ -0,0 +1,299 @@
+import threading
+from collections.abc import Callable, Iterable
+from functools import partial
+from ipaddress import (
+    IPv4Network,
+    IPv6Network,
+    collapse_addresses,
+    ip_address,
+    ip_network,
+    summarize_address_range,
+)
+
+from censys_platform import SDK, models
+from pydantic import Field
+from soar_sdk.abstract import SOARClient
+from soar_sdk.action_results import ActionResult
+from soar_sdk.exceptions import ActionFailure
+from soar_sdk.logging import getLogger
+from soar_sdk.params import Param
+
+from ..accounting import BudgetExceededError, UsageMeter
+from ..cache import CredentialCache
+from ..config import Asset
+from ..utils import create_censys_sdk, is_valid_ip
+from .action_output import (
+    CensysActionOutput,
+    CensysActionSummary,
+    success_results,
+)
+from .batching import BatchLookups, concurrency_field, run_concurrently
+from .params import BudgetParams
+
+logger = getLogger()
+
+IPNetwork = IPv4Network | IPv6Network
+
+# Ranges with at most this many addresses are fetched directly in host batches
+SMALL_RANGE_MAX_ADDRESSES = 256
+
+# Larger ranges are split into sub-queries of this prefix length, made coarser as
+# needed to keep the number of sub-queries bounded
+SUBQUERY_PREFIX_LENGTH = {4: 24, 6: 120}
+MAX_SUBQUERIES = 256
+SEARCH_PAGE_SIZE = 100
+
+
+class LookupIpRangeActionParams(BudgetParams):
+    ip_range: str = Param(
+        description="CIDR block (such as 192.0.2.0/24) or inclusive range of IP addresses (such as 192.0.2.10-192.0.2.50) to lookup.",
+    )
+    max_hosts: int = Field(
+        default=10000,
+        ge=1,
+        required=False,
+        description="The maximum number of hosts to return.",
+    )
+    concurrency: int = concurrency_field(
+        default=4,
+        description="The number of sub-queries or host batches to run at the same time.",
+    )
+
+
+class LookupIpRangeActionOutput(CensysActionOutput):
+    ip_range: str
+    host_count: int
+    hosts: list[models.Host]
+
+
+class LookupIpRangeActionSummary(CensysActionSummary):
+    ip_range: str
+    host_count: int
+    sub_queries: int
+    host_batches: int
+    is_partial: bool
+
+
+def lookup_ip_range(
+    params: LookupIpRangeActionParams,
+    asset: Asset,
+    soar: SOARClient[LookupIpRangeActionSummary],
+):
+    """
+    Retrieves every known host within a CIDR block or IP address range
+    """
+    try:
+        networks = parse_ip_range(params.ip_range)
+    except ValueError:
+        return ActionResult(
+            False,
+            "Please provide a valid CIDR block or IP address range (such as 192.0.2.10-192.0.2.50) in the 'ip_range' action parameter",
+            dict(params),
+        )
+
+    address_count = sum(n.num_addresses for n in networks)
+    meter = UsageMeter.for_run(asset, params.request_budget, params.credit_budget)
+    collector = _HostCollector(params.max_hosts)
+    lookups = BatchLookups(CredentialCache.for_asset(asset))
+    host_batches: list[tuple[str, ...]] = []
+    sub_queries: list[IPNetwork] = []
+
+    with create_censys_sdk(asset, meter) as sdk:
+        if address_count <= SMALL_RANGE_MAX_ADDRESSES:
+            addresses = [str(ip) for n in networks for ip in n]
+            host_batches = lookups.batches(addresses)
+            tasks: list[Callable[[], None]] = [
+                partial(_fetch_host_batch, sdk, lookups, batch, collector)
+                for batch in host_batches
+            ]
+            logger.info(
+                f"Loading {address_count:,} address(es) in {len(host_batches)} host batch(es)"
+            )
+        else:
+            sub_queries = split_networks(networks)
+            tasks = [
+                partial(_search_network, sdk, network, collector)
+                for network in sub_queries
+            ]
+            logger.info(
+                f"Searching {address_count:,} address(es) with {len(sub_queries)} sub-queries"
+            )
+
+        def run(task: Callable[[], None]) -> None:
+            try:
+                task()
+            except Exception:
+                # Spare the other workers' requests; the error is reported below
+                collector.stop()
+                raise
+
+        for _, _, err in run_concurrently(run, tasks, params.concurrency):
+            if err is None:
+                continue
+            if isinstance(err, BudgetExceededError):
+                logger.warning(f"Stopping IP range lookup early: {err}")
+                continue
+
+            logger.error(err)
+            if isinstance(err, models.SDKBaseError):
+                raise ActionFailure(
+                    f"Failed to retrieve hosts with status code: {err.status_code}"
+                ) from err
+            raise ActionFailure("Failed to retrieve hosts with generic error") from err
+
+    hosts = collector.hosts()
+    is_partial = meter.budget_exhausted or collector.is_partial()
+
+    soar.set_summary(
+        LookupIpRangeActionSummary(
+            ip_range=params.ip_range,
+            host_count=len(hosts),
+            sub_queries=len(sub_queries),
+            host_batches=len(host_batches),
+            is_partial=is_partial,
+            **meter.summary_fields(),
+        )
+    )
+
+    message = f"Found {len(hosts):,} host(s) in '{params.ip_range}'"
+    if is_partial:
+        message += "; results are partial because the host limit or budget was reached"
+    soar.set_message(message)
+
+    output = LookupIpRangeActionOutput.trusted(
+        validate=asset.validate_outputs,
+        ip_range=params.ip_range,
+        host_count=len(hosts),
+        hosts=hosts,
+    )
+    return success_results([output], params, soar)
+
+
+def parse_ip_range(value: str) -> list[IPNetwork]:
+    """
+    Parses a CIDR block or a `start-end` address range into a list of networks.
+    """
+    value = value.strip()
+
+    if "-" in value:
+        start, _, end = (part.strip() for part in value.partition("-"))
+        if not is_valid_ip(start) or not is_valid_ip(end):
+            raise ValueError(f"Invalid IP address range: {value}")
+
+        try:
+            return list(summarize_address_range(ip_address(start), ip_address(end)))
+        except (TypeError, ValueError) as err:
+            # Mixed address families, or an end before the start
+            raise ValueError(f"Invalid IP address range: {value}") from err
+
+    try:
+        return [ip_network(value, strict=False)]
+    except ValueError as err:
+        raise ValueError(f"Invalid CIDR block: {value}") from err
+
+
+def split_networks(networks: list[IPNetwork]) -> list[IPNetwork]:
+    """
+    Splits networks into sub-query sized blocks, keeping the total number of blocks
+    at or below `MAX_SUBQUERIES`.
+    """
+    networks = list(collapse_addresses(networks))
+    version = networks[0].version
+    prefix_length = SUBQUERY_PREFIX_LENGTH[version]
+
+    while prefix_length > 0:
+        count = sum(2 ** max(prefix_length - n.prefixlen, 0) for n in networks)
+        if count <= MAX_SUBQUERIES:
+            break
+        prefix_length -= 1
+
+    return [
+        subnet
+        for n in networks
+        for subnet in (
+            n.subnets(new_prefix=prefix_length) if n.prefixlen < prefix_length else [n]
+        )
+    ]
+
+
+class _HostCollector:
+    """
+    Merges and dedupes hosts found by concurrent workers, up to a maximum count. The
+    results are partial once a host beyond the maximum was dropped, or a worker was
+    stopped before it fetched everything it was given.
+    """
+
+    def __init__(self, max_hosts: int) -> None:
+        self._max_hosts = max_hosts
+        self._hosts: dict[str, models.Host] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._is_partial = False
+
+    def add(self, hosts: Iterable[models.Host]) -> None:
+        with self._lock:
+            for host in hosts:
+                if not host.ip or host.ip in self._hosts:
+                    continue
+                if len(self._hosts) >= self._max_hosts:
+                    # No need for the other workers to carry on
+                    self._is_partial = True
+                    self._stopped.set()
+                    return
+                self._hosts[host.ip] = host
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def skip(self) -> None:
+        """
+        Records that a worker stopped early, leaving part of its addresses unread.
+        """
+        self._is_partial = True
+
+    def is_stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def is_partial(self) -> bool:
+        return self._is_partial
+
+    def hosts(self) -> list[models.Host]:
+        return sorted(self._hosts.values(), key=lambda h: ip_address(h.ip))
+
+
+def _fetch_host_batch(
+    sdk: SDK, lookups: BatchLookups, ips: tuple[str, ...], collector: _HostCollector
+) -> None:
+    if collector.is_stopped():
+        collector.skip()
+        return
+
+    collector.add(lookups.fetch(sdk, "host", ips).values())
+
+
+def _search_network(sdk: SDK, network: IPNetwork, collector: _HostCollector) -> None:
+    target = (
+        str(network.network_address) if network.num_addresses == 1 else str(network)
+    )
+    page_token: str | None = None
+
+    while True:
+        if collector.is_stopped():
+            collector.skip()
+            return
+
+        res = sdk.global_data.search(
+            search_query_input_body=models.SearchQueryInputBody(
+                query=f'host.ip: "{target}"',
+                page_size=SEARCH_PAGE_SIZE,
+                page_token=page_token,
+            )
+        )
+        data = res.result.result
+        collector.add(
+            hit.host_v1.resource for hit in data.hits or [] if hit.host_v1 is not None
+        )
+
+        page_token = data.next_page_token
+        if not page_token:
+            return
@@ -0,0 +1,292 @@
+from censys_platform import SDK, models
+from soar_sdk.abstract import SOARClient
+from soar_sdk.action_results import ActionResult
+from soar_sdk.logging import getLogger
+from soar_sdk.params import Param
+
+from ..accounting import UsageMeter
+from ..cache import CredentialCache, NegativeCache
+from ..config import Asset
+from ..inputs import (
+    normalize_at_time,
+    normalize_inputs,
+    normalize_ip,
+    normalize_web_property,
+)
+from ..streaming import stream_host
+from ..utils import create_censys_sdk
+from .action_output import (
+    CensysActionOutput,
+    CensysActionSummary,
+    success_results,
+)
+from .batching import (
+    BatchLookups,
+    concurrency_field,
+    describe_error,
+    run_concurrently,
+)
+from .params import BudgetParams
+from .projection import apply_projection, compile_projection
+
+logger = getLogger()
+
+# Host services with these protocols are expanded into web property lookups
+HTTP_PROTOCOLS = frozenset({"HTTP", "HTTPS"})
+
+
+class LookupWebPropertiesActionParams(BudgetParams):
+    targets: str = Param(
+        default="",
+        required=False,
+        description="Comma-separated list of web properties to lookup as hostname:port pairs or URLs, such as 'example.com:443,https://192.0.2.1:8080'. Defanged values such as 'example[.]com:443' are accepted.",
+    )
+    expand_ip: str = Param(
+        default="",
+        required=False,
+        description="IPv4/IPv6 address of a host whose HTTP services should also be looked up as web properties.",
+    )
+    at_time: str = Param(
+        default=None,
+        required=False,
+        description="The historical timestamp to retrieve web property data for. If unspecified, we will retrieve the latest data.",
+    )
+    fields: str = Param(
+        default="",
+        required=False,
+        description="Comma-separated list of web property fields to keep in the output, such as 'endpoints.path,software,cert.fingerprint_sha256'. If unspecified, the whole web property is returned.",
+    )
+    concurrency: int = concurrency_field(
+        default=4,
+        description="The number of web property batches to fetch at the same time.",
+    )
+
+
+class LookupWebPropertiesActionOutput(CensysActionOutput):
+    target: str
+    source: str
+    found: bool
+    error: str | None = None
+    web: models.Webproperty | None = None
+
+
+class LookupWebPropertiesActionSummary(CensysActionSummary):
+    target_count: int
+    found_count: int
+    error_count: int
+    expanded_count: int
+
+
+def lookup_web_properties(
+    params: LookupWebPropertiesActionParams,
+    asset: Asset,
+    soar: SOARClient[LookupWebPropertiesActionSummary],
+):
+    """
+    Retrieves many web properties by hostname:port, optionally including every HTTP
+    service of a host
+    """
+    if not params.targets.strip() and not params.expand_ip:
+        return ActionResult(
+            False,
+            "Please provide web properties in the 'targets' action parameter, a host IP address in the 'expand_ip' action parameter, or both",
+            dict(params),
+        )
+
+    expand_ip: str | None = None
+    if params.expand_ip:
+        try:
+            expand_ip = normalize_ip(params.expand_ip)
+        except ValueError:
+            return ActionResult(
+                False,
+                "Please provide a valid IPv4/IPv6 value in the 'expand_ip' action parameter, or leave it unset",
+                dict(params),
+            )
+
+    at_time: str | None = None
+    if params.at_time:
+        try:
+            at_time = normalize_at_time(params.at_time)
+        except ValueError:
+            return ActionResult(
+                False,
+                "Please provide a valid ISO 8601 timestamp in the 'at_time' action parameter, or leave it unset",
+                dict(params),
+            )
+
+    try:
+        projection = compile_projection(
+            models.Webproperty, params.fields, ("hostname", "port")
+        )
+    except ValueError as err:
+        return ActionResult(
+            False,
+            f"Please provide valid web property fields in the 'fields' action parameter: {err}",
+            dict(params),
+        )
+
+    meter = UsageMeter.for_run(asset, params.request_budget, params.credit_budget)
+    negative_cache = NegativeCache.for_asset(asset)
+    lookups = BatchLookups(CredentialCache.for_asset(asset))
+    outputs: dict[str, LookupWebPropertiesActionOutput] = {}
+    pending: list[str] = []
+    # The status code of each target that was not found or was invalid, to fail
+    # repeat lookups fast like lookup_web_property does
+    misses: dict[str, int] = {}
+
+    def cache_key(target: str) -> str:
+        return f"{target}@{at_time or ''}"
+
+    def add_target(target: str, source: str) -> None:
+        if target in outputs:
+            return
+
+        error: str | None = None
+        if cached := negative_cache.get("web", cache_key(target)):
+            meter.record_cache_hit()
+            error = f"Failed to retrieve web property with status code: {cached} (cached result)"
+
+        outputs[target] = LookupWebPropertiesActionOutput(
+            target=target, source=source, found=False, error=error
+        )
+        if error is None:
+            pending.append(target)
+
+    targets = normalize_inputs(params.targets, normalize_web_property)
+    for rejected in targets.rejected:
+        outputs.setdefault(
+            rejected.value,
+            LookupWebPropertiesActionOutput(
+                target=rejected.value,
+                source="input",
+                found=False,
+                error=f"Invalid target: {rejected.reason}",
+            ),
+        )
+    for target in targets.accepted:
+        add_target(target, "input")
+
+    with create_censys_sdk(asset, meter) as sdk:
+        if expand_ip is not None:
+            host_cache_key = f"{expand_ip}@{at_time or ''}"
+            host_error: str | None = None
+
+            if (
+                cached_status := negative_cache.get("host", host_cache_key)
+            ) is not None:
+                meter.record_cache_hit()
+                host_error = f"Failed to retrieve host with status code: {cached_status} (cached result)"
+            else:
+                try:
+                    for target in expand_host_targets(
+                        sdk, asset, meter, expand_ip, at_time
+                    ):
+                        add_target(target, "expand")
+                except Exception as err:
+                    logger.error(err)
+                    if isinstance(err, models.SDKBaseError):
+                        negative_cache.put("host", host_cache_key, err.status_code)
+                    host_error = describe_error("host", err)
+
+            if host_error is not None:
+                outputs[expand_ip] = LookupWebPropertiesActionOutput(
+                    target=expand_ip,
+                    source="expand",
+                    found=False,
+                    error=host_error,
+                )
+
+        batches = lookups.batches(pending)
+        logger.info(
+            f"Loading {len(pending):,} web property(s) in {len(batches)} batch(es)"
+        )
+
+        for batch, found, err in run_concurrently(
+            lambda batch: lookups.fetch(sdk, "web", batch, at_time),
+            batches,
+            params.concurrency,
+        ):
+            if err is not None:
+                logger.error(err)
+                for target in batch:
+                    outputs[target].error = describe_error("web property", err)
+                # The error of a whole batch cannot be blamed on any one target
+                if isinstance(err, models.SDKBaseError) and len(batch) == 1:
+                    misses[batch[0]] = err.status_code
+                continue
+
+            for target in batch:
+                web = found.get(target.lower())
+                if web is None:
+                    outputs[target].error = "Web property not found"
+                    misses[target] = 404
+                    continue
+
+                try:
+                    outputs[target].web = apply_projection(web, projection)
+                except Exception as err:
+                    logger.error(err)
+                    outputs[
+                        target
+                    ].error = "Failed to select the requested web property fields"
+                    continue
+
+                outputs[target].found = True
+
+    negative_cache.put_many(
+        "web", {cache_key(target): status for target, status in misses.items()}
+    )
+
+    results = [
+        LookupWebPropertiesActionOutput.trusted(
+            validate=asset.validate_outputs, **dict(output)
+        )
+        for output in outputs.values()
+    ]
+    found_count = sum(r.found for r in results)
+    error_count = len(results) - found_count
+    expanded_count = sum(r.source == "expand" for r in results)
+
+    soar.set_summary(
+        LookupWebPropertiesActionSummary(
+            target_count=len(results),
+            found_count=found_count,
+            error_count=error_count,
+            expanded_count=expanded_count,
+            **meter.summary_fields(),
+        )
+    )
+
+    message = f"Found {found_count:,} of {len(results):,} web property(s)"
+    if error_count:
+        message += f"; {error_count:,} could not be retrieved"
+    soar.set_message(message)
+
+    return success_results(results, params, soar)
+
+
+def expand_host_targets(
+    sdk: SDK, asset: Asset, meter: UsageMeter, ip: str, at_time: str | None
+) -> list[str]:
+    """
+    Looks up a host and returns an `ip:port` web property target for each of its HTTP
+    services.
+    """
+    if asset.stream_responses:
+        host = stream_host(sdk, meter, ip, at_time)
+    else:
+        host = sdk.global_data.get_host(
+            host_id=ip, at_time=at_time
+        ).result.result.resource
+
+    ports = sorted(
+        {
+            s.port
+            for s in host.services or []
+            if s.port and (s.protocol or "").upper() in HTTP_PROTOCOLS
+        }
+    )
+    logger.info(f"Expanding host {ip} into {len(ports)} HTTP service(s)")
+
+    return [f"{ip}:{port}" for port in ports]
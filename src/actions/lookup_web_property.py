@@ -1,40 +1,60 @@
+import heapq
+
 from censys_platform import models
 from pydantic import Field
 from soar_sdk.abstract import SOARClient
-from soar_sdk.action_results import ActionOutput, ActionResult
+from soar_sdk.action_results import ActionResult
 from soar_sdk.exceptions import ActionFailure
 from soar_sdk.logging import getLogger
-from soar_sdk.params import Param, Params
+from soar_sdk.models.view import ViewContext
+from soar_sdk.params import Param
 
+from ..accounting import UsageMeter
+from ..cache import NegativeCache, ResponseCache
 from ..config import Asset
-from ..utils import (
-    create_censys_sdk,
-    get_attr_path,
-    is_valid_at_time,
-    is_valid_web_property_hostname,
+from ..inputs import normalize_at_time, normalize_hostname
+from ..streaming import stream_web_property
+from ..utils import create_censys_sdk, get_attr_path
+from .action_output import (
+    CensysActionOutput,
+    CensysActionSummary,
+    failed_result,
+    success_results,
+)
+from .params import BudgetParams
+from .projection import apply_projection, compile_projection
+from .utils import (
+    count_by,
+    format_software,
+    get_show_more_link,
+    get_view_row_limit,
+    memoize_cert_fields,
 )
-from .action_output import CensysActionOutput
-from .utils import format_software, extract_cert_fields
 
 
 logger = getLogger()
 
 
-class GetWebPropertyActionParams(Params):
+class GetWebPropertyActionParams(BudgetParams):
     hostname: str
-    port: int = Field(gte=1, lte=65535)
+    port: int = Field(ge=1, le=65535)
     at_time: str = Param(
         default=None,
         required=False,
         description="The historical timestamp to retrieve web property data for. If unspecified, we will retrieve the latest data.",
     )
+    fields: str = Param(
+        default="",
+        required=False,
+        description="Comma-separated list of web property fields to keep in the output, such as 'endpoints.path,software,cert.fingerprint_sha256'. If unspecified, the whole web property is returned.",
+    )
 
 
 class GetWebPropertyActionOutput(CensysActionOutput):
     web: models.Webproperty
 
 
-class GetWebPropertyActionSummary(ActionOutput):
+class GetWebPropertyActionSummary(CensysActionSummary):
     hostname: str
     port: int
     scan_time: str
@@ -46,48 +66,102 @@ def lookup_web_property(
     params: GetWebPropertyActionParams,
     asset: Asset,
     soar: SOARClient[GetWebPropertyActionSummary],
-) -> GetWebPropertyActionOutput:
+):
     """
     Retrieves a web property by domain_name:port
     """
-    if not is_valid_web_property_hostname(params.hostname):
+    try:
+        hostname = normalize_hostname(params.hostname)
+    except ValueError:
         return ActionResult(
             False,
             "Please provide a valid domain name or IP address value in the 'hostname' action parameter",
             dict(params),
         )
 
-    if params.at_time is not None and not is_valid_at_time(params.at_time):
+    at_time: str | None = None
+    if params.at_time:
+        try:
+            at_time = normalize_at_time(params.at_time)
+        except ValueError:
+            return ActionResult(
+                False,
+                "Please provide a valid ISO 8601 timestamp in the 'at_time' action parameter, or leave it unset",
+                dict(params),
+            )
+
+    try:
+        projection = compile_projection(
+            models.Webproperty, params.fields, ("hostname", "port")
+        )
+    except ValueError as err:
         return ActionResult(
             False,
-            "Please provide a valid ISO 8601 timestamp in the 'at_time' action parameter, or leave it unset",
+            f"Please provide valid web property fields in the 'fields' action parameter: {err}",
             dict(params),
         )
 
-    web_property_id = f"{params.hostname}:{params.port}"
+    web_property_id = f"{hostname}:{params.port}"
     logger.info(
-        f"Loading web property with ID {web_property_id} (at_time: {params.at_time if params.at_time is not None else 'unspecified'})"
+        f"Loading web property with ID {web_property_id} (at_time: {at_time or 'unspecified'})"
     )
     data: models.Webproperty | None = None
+    meter = UsageMeter.for_run(asset, params.request_budget, params.credit_budget)
+    negative_cache = NegativeCache.for_asset(asset)
+    response_cache = ResponseCache.for_asset(asset)
+    cache_key = f"{web_property_id}@{at_time or ''}"
 
-    with create_censys_sdk(asset) as sdk:
-        try:
-            res = sdk.global_data.get_web_property(
-                webproperty_id=web_property_id,
-                at_time=str(params.at_time) if params.at_time else None,
+    if (cached_status := negative_cache.get("web", cache_key)) is not None:
+        logger.info(
+            f"Skipping web property lookup of {cache_key}: cached {cached_status} result"
+        )
+        meter.record_cache_hit()
+        return failed_result(
+            f"Failed to retrieve web property with status code: {cached_status} (cached result)",
+            params,
+            meter,
+        )
+
+    if at_time is None:
+        data = response_cache.get("web", web_property_id, models.Webproperty)
+        if data is not None:
+            logger.info(
+                f"Serving web property {web_property_id} from the response cache"
             )
-            data = res.result.result.resource
-            logger.debug("Successfully retrieved web property")
-        except models.SDKBaseError as err:
-            logger.error(err)
-            raise ActionFailure(
-                f"Failed to retrieve web property with status code: {err.status_code}"
-            ) from err
-        except Exception as err:
-            logger.error(err)
-            raise ActionFailure(
-                "Failed to retrieve web property with generic error"
-            ) from err
+            meter.record_cache_hit()
+
+    if data is None:
+        with create_censys_sdk(asset, meter) as sdk:
+            try:
+                if asset.stream_responses:
+                    data = stream_web_property(sdk, meter, web_property_id, at_time)
+                else:
+                    res = sdk.global_data.get_web_property(
+                        webproperty_id=web_property_id, at_time=at_time
+                    )
+                    data = res.result.result.resource
+                logger.debug("Successfully retrieved web property")
+                if at_time is None:
+                    response_cache.put("web", web_property_id, data)
+            except models.SDKBaseError as err:
+                logger.error(err)
+                negative_cache.put("web", cache_key, err.status_code)
+                raise ActionFailure(
+                    f"Failed to retrieve web property with status code: {err.status_code}"
+                ) from err
+            except Exception as err:
+                logger.error(err)
+                raise ActionFailure(
+                    "Failed to retrieve web property with generic error"
+                ) from err
+
+    try:
+        web = apply_projection(data, projection)
+    except Exception as err:
+        logger.error(err)
+        raise ActionFailure(
+            "Failed to select the requested web property fields"
+        ) from err
 
     soar.set_summary(
         GetWebPropertyActionSummary(
@@ -96,18 +170,30 @@ def lookup_web_property(
             scan_time=data.scan_time,
             endpoints=[e.path for e in data.endpoints],
             endpoint_count=len(data.endpoints),
+            **meter.summary_fields(),
         )
     )
     soar.set_message(
         f"Web Property '{data.hostname}:{data.port}' has {len(data.endpoints):,} visible endpoint(s)"
     )
 
-    return GetWebPropertyActionOutput(web=data)
+    output = GetWebPropertyActionOutput.trusted(
+        validate=asset.validate_outputs, web=web
+    )
+    return success_results([output], params, soar)
 
 
 def lookup_web_property_view_handler(
+    context: ViewContext,
     all_outputs: list[GetWebPropertyActionOutput],
 ) -> dict:
+    limit = get_view_row_limit(context)
+    max_endpoint_total = max(
+        (len(get_attr_path(o, "web.endpoints", None) or []) for o in all_outputs),
+        default=0,
+    )
+    certs: dict[str, dict] = {}
+
     return {
         "results": [
             {
@@ -115,12 +201,20 @@ def lookup_web_property_view_handler(
                 "port": output.web.port,
                 "scan_time": get_attr_path(output, "web.scan_time", "N/A"),
                 "software": render_software(output),
-                "endpoints": render_endpoints(output),
-                "cert": extract_cert_fields(get_attr_path(output, "web.cert", None)),
+                "endpoints": render_endpoints(output, limit),
+                "endpoint_total": len(
+                    get_attr_path(output, "web.endpoints", None) or []
+                ),
+                "endpoint_groups": render_endpoint_groups(output),
+                "cert_fingerprint": memoize_cert_fields(
+                    get_attr_path(output, "web.cert", None), certs
+                ),
             }
             for output in all_outputs
         ],
+        "certs": certs,
         "total_count": len(all_outputs),
+        "show_more_link": get_show_more_link(context, limit, max_endpoint_total),
     }
 
 
@@ -139,11 +233,22 @@ def render_software(output: GetWebPropertyActionOutput) -> list[str]:
     return sorted(list(software_set))
 
 
-def render_endpoints(output: GetWebPropertyActionOutput) -> list[dict]:
+def render_endpoints(
+    output: GetWebPropertyActionOutput, limit: int | None = None
+) -> list[dict]:
+    """
+    Renders the web property's endpoints ordered by path. When a limit is given, only
+    the first `limit` endpoints are rendered.
+    """
     endpoints = get_attr_path(output, "web.endpoints", [])
     if not endpoints:
         return []
 
+    if limit is not None:
+        endpoints = heapq.nsmallest(limit, endpoints, key=_endpoint_sort_key)
+    else:
+        endpoints = sorted(endpoints, key=_endpoint_sort_key)
+
     return [
         {
             "path": getattr(ep, "path", None),
@@ -151,3 +256,17 @@ def render_endpoints(output: GetWebPropertyActionOutput) -> list[dict]:
         }
         for ep in endpoints
     ]
+
+
+def render_endpoint_groups(output: GetWebPropertyActionOutput) -> list[dict]:
+    return count_by(
+        get_attr_path(output, "web.endpoints", None) or [],
+        lambda ep: getattr(ep, "endpoint_type", None),
+    )
+
+
+def _endpoint_sort_key(endpoint: models.EndpointScanState) -> tuple[str, str]:
+    return (
+        getattr(endpoint, "path", None) or "",
+        getattr(endpoint, "endpoint_type", None) or "",
+    )
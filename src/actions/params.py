@@ -0,0 +1,19 @@
+from soar_sdk.params import Param, Params
+
+
+class BudgetParams(Params):
+    """
+    Parameters shared by every action that calls the API, to cap a single run below
+    the asset's budgets.
+    """
+
+    request_budget: int = Param(
+        default=0,
+        required=False,
+        description="Maximum number of API requests this run may make (0 for the asset's default).",
+    )
+    credit_budget: float = Param(
+        default=0,
+        required=False,
+        description="Maximum number of credits this run may use (0 for the asset's default).",
+    )
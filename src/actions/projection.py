@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import types
+import typing
+from functools import lru_cache
+from typing import Any, Union, get_args, get_origin
+
+import typing_extensions
+from censys_platform.types import UNSET
+from pydantic import BaseModel
+
+# A compiled projection maps each kept field name to the projection of its value, or
+# to None when the whole subtree is kept.
+Projection = dict[str, "Projection | None"]
+
+_Unset = type(UNSET)
+
+# The SDK declares `Nullable` and `OptionalNullable` with the typing_extensions
+# backport, which is a distinct class from `typing.TypeAliasType` before Python 3.14
+_TYPE_ALIAS_TYPES = (typing.TypeAliasType, typing_extensions.TypeAliasType)
+
+
+@lru_cache(maxsize=64)
+def compile_projection(
+    model_cls: type[BaseModel], fields: str, always_include: tuple[str, ...] = ()
+) -> Projection | None:
+    """
+    Compiles a comma-separated list of dotted field paths, such as
+    `services.port,services.protocol,dns`, into a projection for `model_cls`. Paths are
+    checked against the model tree up front so that typos are reported before any API
+    request is made. Returns None when no fields were requested.
+    """
+    paths = [p.strip() for p in fields.split(",") if p.strip()]
+    if not paths:
+        return None
+
+    projection: Projection = {}
+    for path in [*paths, *always_include]:
+        _add_path(projection, model_cls, path.split("."), path)
+
+    return projection
+
+
+def apply_projection[M: BaseModel](model: M, projection: Projection | None) -> M:
+    """
+    Returns a copy of `model` that only carries the projected subtrees. Kept values are
+    shared with the original rather than copied or re-validated.
+    """
+    if projection is None:
+        return model
+
+    return _project(model, projection)
+
+
+def _project(value: Any, projection: Projection | None) -> Any:
+    # The SDK's UNSET marker is itself a model, but has none of the projected fields
+    if projection is None or value is None or isinstance(value, _Unset):
+        return value
+
+    if isinstance(value, list):
+        return [_project(v, projection) for v in value]
+
+    if isinstance(value, dict):
+        return {k: _project(v, projection) for k, v in value.items()}
+
+    if not isinstance(value, BaseModel):
+        return value
+
+    kept = {
+        name: _project(getattr(value, name), sub_projection)
+        for name, sub_projection in projection.items()
+    }
+    return type(value).model_construct(_fields_set=set(kept), **kept)
+
+
+def _add_path(
+    projection: Projection,
+    model_cls: type[BaseModel],
+    parts: list[str],
+    full_path: str,
+) -> None:
+    name = _resolve_field_name(model_cls, parts[0])
+    if name is None:
+        raise ValueError(f"Unknown field '{parts[0]}' in field path '{full_path}'")
+
+    rest = parts[1:]
+    if not rest:
+        projection[name] = None
+        return
+
+    if name in projection and projection[name] is None:
+        # The whole subtree has already been requested
+        return
+
+    nested_cls = _unwrap_model_type(model_cls.model_fields[name].annotation)
+    if nested_cls is None:
+        raise ValueError(
+            f"Field '{parts[0]}' in field path '{full_path}' has no nested fields"
+        )
+
+    sub_projection = projection.setdefault(name, {})
+    _add_path(sub_projection, nested_cls, rest, full_path)
+
+
+def _resolve_field_name(model_cls: type[BaseModel], key: str) -> str | None:
+    for name, field in model_cls.model_fields.items():
+        if key in (name, field.alias):
+            return name
+    return None
+
+
+def _unwrap_model_type(field_type: Any) -> type[BaseModel] | None:
+    """
+    Finds the model class behind Optional, Nullable, list and dict annotations.
+    """
+    while True:
+        origin = get_origin(field_type)
+
+        if isinstance(origin, _TYPE_ALIAS_TYPES):
+            field_type = get_args(field_type)[0]
+        elif origin in [Union, types.UnionType]:
+            type_args = [
+                arg
+                for arg in get_args(field_type)
+                if arg is not type(None) and arg is not None
+            ]
+            if len(type_args) != 1:
+                return None
+            field_type = type_args[0]
+        elif origin is list:
+            field_type = get_args(field_type)[0]
+        elif origin is dict:
+            field_type = get_args(field_type)[1]
+        else:
+            break
+
+    if isinstance(field_type, type) and issubclass(field_type, BaseModel):
+        return field_type
+
+    return None
@@ -1,32 +1,66 @@
 from soar_sdk.app import App
 
-from .lookup_cert import lookup_cert, lookup_cert_view_handler
-from .lookup_host import lookup_host, lookup_host_view_handler
-from .lookup_web_property import lookup_web_property, lookup_web_property_view_handler
-from .search import search
+from .lookup_cert import GetCertActionOutput, lookup_cert, lookup_cert_view_handler
+from .lookup_host import GetHostActionOutput, lookup_host, lookup_host_view_handler
+from .lookup_ip_range import LookupIpRangeActionOutput, lookup_ip_range
+from .lookup_web_properties import (
+    LookupWebPropertiesActionOutput,
+    lookup_web_properties,
+)
+from .lookup_web_property import (
+    GetWebPropertyActionOutput,
+    lookup_web_property,
+    lookup_web_property_view_handler,
+)
+from .search import SearchActionOutput, search
+from .warm_cache import WarmCacheActionOutput, warm_cache
 
 
 def register_all_actions(app: App) -> None:
+    # Actions return their results already dumped (see `success_results`), so their
+    # output classes, which describe the results in the manifest, are given here
     app.register_action(
         lookup_cert,
+        output_class=GetCertActionOutput,
         view_handler=lookup_cert_view_handler,
         view_template="lookup_cert.html",
         verbose="Retrieve a certificate by SHA256 fingerprint from the Censys Platform API",
     )
     app.register_action(
         lookup_host,
+        output_class=GetHostActionOutput,
         view_handler=lookup_host_view_handler,
         view_template="lookup_host.html",
         verbose="Retrieve a host by IP address from the Censys Platform API",
     )
+    app.register_action(
+        lookup_ip_range,
+        output_class=LookupIpRangeActionOutput,
+        render_as="json",
+        verbose="Retrieve every known host within a CIDR block or IP address range from the Censys Platform API",
+    )
+    app.register_action(
+        lookup_web_properties,
+        output_class=LookupWebPropertiesActionOutput,
+        render_as="json",
+        verbose="Retrieve many web properties by domain_name:port, or every HTTP service of a host, from the Censys Platform API",
+    )
     app.register_action(
         lookup_web_property,
+        output_class=GetWebPropertyActionOutput,
         view_handler=lookup_web_property_view_handler,
         view_template="lookup_web_property.html",
         verbose="Retrieve a web property by domain_name:port from the Censys Platform API",
     )
     app.register_action(
         search,
+        output_class=SearchActionOutput,
         render_as="json",
         verbose="Searches across all Censys assets using the provided CenQL query",
     )
+    app.register_action(
+        warm_cache,
+        output_class=WarmCacheActionOutput,
+        render_as="json",
+        verbose="Fetch a watchlist of hosts, certificates and web properties, given directly or by a CenQL query, into the local response cache so that later lookups of them are served without calling the API. Run it from a scheduled playbook to keep the cache warm",
+    )
@@ -1,79 +1,168 @@
 from censys_platform import models
 from pydantic import Field
 from soar_sdk.abstract import SOARClient
-from soar_sdk.action_results import ActionOutput
+from soar_sdk.action_results import ActionResult
 from soar_sdk.exceptions import ActionFailure
 from soar_sdk.logging import getLogger
-from soar_sdk.params import Param, Params
+from soar_sdk.params import Param
 
+from ..accounting import BudgetExceededError, UsageMeter
 from ..config import Asset
+from ..streaming import stream_search
 from ..utils import create_censys_sdk
-from .action_output import CensysActionOutput
+from .action_output import (
+    CensysActionOutput,
+    CensysActionSummary,
+    success_results,
+)
+from .columnar import ColumnarHitsBuilder, SearchResourceColumns, parse_columns
+from .params import BudgetParams
 
 logger = getLogger()
 
 
-class SearchActionParams(Params):
+class SearchActionParams(BudgetParams):
     query: str = Param(
         description="The CenQL search query to execute.",
     )
     page_size: int = Field(
         default=100,
-        gte=0,
+        ge=0,
         required=False,
         description="The maximum number of results to include in each page.",
     )
+    max_pages: int = Field(
+        default=1,
+        ge=1,
+        required=False,
+        description="The maximum number of pages to retrieve.",
+    )
+    output_mode: str = Param(
+        default="full",
+        required=False,
+        value_list=["full", "compact"],
+        description="'full' returns every hit as a nested object. 'compact' splits hits by resource type and returns only the selected columns as parallel arrays.",
+    )
+    columns: str = Param(
+        default="",
+        required=False,
+        description="Comma-separated list of CenQL fields to return in compact mode, such as 'host.ip,host.location.country,web.hostname'. If unspecified, a default set of identifying fields is returned.",
+    )
 
 
 class SearchActionOutput(CensysActionOutput):
     hits: list[models.SearchQueryHit]
+    compact: list[SearchResourceColumns] = Field(default_factory=list)
     query_duration_millis: int
     total_hits: float
 
 
-class SearchActionSummary(ActionOutput):
+class SearchActionSummary(CensysActionSummary):
     query_duration_millis: int
     total_hits: float
+    pages: int
 
 
 def search(
     params: SearchActionParams, asset: Asset, soar: SOARClient[SearchActionSummary]
-) -> SearchActionOutput:
+):
     """
     Performs a search using the provided CenQL query string
     """
-    logger.info(f"Performing search with page size {params.page_size}")
-    data: models.SearchQueryResponse | None = None
+    if params.output_mode not in ("full", "compact"):
+        return ActionResult(
+            False,
+            "Please provide either 'full' or 'compact' in the 'output_mode' action parameter",
+            dict(params),
+        )
 
-    with create_censys_sdk(asset) as sdk:
+    columns: tuple[str, ...] | None = None
+    if params.output_mode == "compact":
         try:
-            res = sdk.global_data.search(
-                search_query_input_body=models.SearchQueryInputBody(
-                    query=params.query, page_size=params.page_size
-                )
+            columns = parse_columns(params.columns)
+        except ValueError as err:
+            return ActionResult(
+                False,
+                f"Please provide valid CenQL fields in the 'columns' action parameter: {err}",
+                dict(params),
             )
-            data = res.result.result
-            logger.debug("Successfully executed search")
-        except models.SDKBaseError as err:
-            logger.error(err)
-            raise ActionFailure(
-                f"Failed to execute search with status code: {err.status_code}"
-            ) from err
-        except Exception as err:
-            logger.error(err)
-            raise ActionFailure("Failed to execute search with generic error") from err
+
+    logger.info(
+        f"Performing search with page size {params.page_size} and up to {params.max_pages} page(s)"
+    )
+    hits: list[models.SearchQueryHit] = []
+    columnar = ColumnarHitsBuilder(columns) if columns is not None else None
+    query_duration_millis = 0
+    total_hits = 0.0
+    pages = 0
+    page_token: str | None = None
+    meter = UsageMeter.for_run(asset, params.request_budget, params.credit_budget)
+
+    def on_hit(hit: models.SearchQueryHit) -> None:
+        if columnar is not None:
+            columnar.add_hits((hit,))
+        else:
+            hits.append(hit)
+
+    with create_censys_sdk(asset, meter) as sdk:
+        while pages < params.max_pages:
+            try:
+                body = models.SearchQueryInputBody(
+                    query=params.query,
+                    page_size=params.page_size,
+                    page_token=page_token,
+                    fields=list(columns) if columns is not None else None,
+                )
+                if asset.stream_responses:
+                    data = stream_search(sdk, meter, body, on_hit)
+                else:
+                    data = sdk.global_data.search(
+                        search_query_input_body=body
+                    ).result.result
+                    for hit in data.hits or []:
+                        on_hit(hit)
+                logger.debug(f"Successfully executed search page {pages + 1}")
+            except BudgetExceededError as err:
+                logger.warning(f"Stopping search early: {err}")
+                break
+            except models.SDKBaseError as err:
+                logger.error(err)
+                raise ActionFailure(
+                    f"Failed to execute search with status code: {err.status_code}"
+                ) from err
+            except Exception as err:
+                logger.error(err)
+                raise ActionFailure(
+                    "Failed to execute search with generic error"
+                ) from err
+
+            pages += 1
+            query_duration_millis += data.query_duration_millis
+            total_hits = data.total_hits
+            page_token = data.next_page_token
+
+            if not page_token:
+                break
 
     soar.set_summary(
         SearchActionSummary(
-            query_duration_millis=data.query_duration_millis, total_hits=data.total_hits
+            query_duration_millis=query_duration_millis,
+            total_hits=total_hits,
+            pages=pages,
+            **meter.summary_fields(),
         )
     )
-    soar.set_message(
-        f"Search took {(data.query_duration_millis / 1000):.2n} seconds, found {int(data.total_hits):,} result(s)"
-    )
 
-    return SearchActionOutput(
-        hits=data.hits,
-        query_duration_millis=data.query_duration_millis,
-        total_hits=data.total_hits,
+    message = f"Search took {(query_duration_millis / 1000):.2n} seconds, found {int(total_hits):,} result(s)"
+    if meter.budget_exhausted:
+        message += f"; stopped after {pages:,} page(s) because the budget was exhausted"
+    soar.set_message(message)
+
+    output = SearchActionOutput.trusted(
+        validate=asset.validate_outputs,
+        hits=hits,
+        compact=columnar.build() if columnar is not None else [],
+        query_duration_millis=query_duration_millis,
+        total_hits=total_hits,
     )
+    return success_results([output], params, soar)
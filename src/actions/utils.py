@@ -1,8 +1,19 @@
+from collections import Counter
+from collections.abc import Callable, Iterable
 from string import capwords
+from urllib.parse import urlencode
+
 from censys_platform import models
+from soar_sdk.models.view import ViewContext
 
 from ..utils import get_attr_path
 
+# View widgets render at most this many rows per list unless the "show more" link
+# requested more, and never more than the hard maximum.
+DEFAULT_VIEW_ROW_LIMIT = 25
+MAX_VIEW_ROW_LIMIT = 1000
+VIEW_ROW_LIMIT_PARAM = "censys_rows"
+
 
 def format_software(
     vendor: str | None, product: str | None, version: str | None
@@ -44,6 +55,25 @@ def extract_cert_fields(cert: models.Certificate) -> dict:
     }
 
 
+def memoize_cert_fields(
+    cert: models.Certificate | None, memo: dict[str, dict]
+) -> str | None:
+    """
+    Extracts a certificate's display fields at most once per render, keyed by its
+    SHA256 fingerprint, and returns the key to look the shared row up in `memo`.
+    Certificates without a fingerprint cannot be matched to each other, so each gets a
+    row of its own. Returns None when there is no certificate.
+    """
+    if not isinstance(cert, models.Certificate):
+        return None
+
+    key = cert.fingerprint_sha256 or f"unknown-{len(memo)}"
+    if key not in memo:
+        memo[key] = extract_cert_fields(cert)
+
+    return key
+
+
 def get_cert_display_name(cert: models.Certificate) -> str | None:
     """
     Attempts to produce a human-readable name for a certificate in the same way as the Censys Platform.
@@ -81,3 +111,40 @@ def _render_self_signed(cert: models.Certificate) -> str:
     elif self_signed is False:
         return "No"
     return "Unknown"
+
+
+def get_view_row_limit(context: ViewContext) -> int:
+    """
+    Reads the per-list row limit requested through the widget's query string.
+    """
+    values = context.QS.get(VIEW_ROW_LIMIT_PARAM) or []
+    try:
+        limit = int(values[-1])
+    except (IndexError, ValueError):
+        return DEFAULT_VIEW_ROW_LIMIT
+
+    return max(1, min(limit, MAX_VIEW_ROW_LIMIT))
+
+
+def get_show_more_link(context: ViewContext, limit: int, total: int) -> str | None:
+    """
+    Builds a query string that reloads the widget with a larger row limit, or None if
+    every row is already shown or the hard maximum has been reached.
+    """
+    if total <= limit or limit >= MAX_VIEW_ROW_LIMIT:
+        return None
+
+    query = dict(context.QS)
+    query[VIEW_ROW_LIMIT_PARAM] = [str(min(limit * 4, MAX_VIEW_ROW_LIMIT))]
+    return "?" + urlencode(query, doseq=True)
+
+
+def count_by[T](items: Iterable[T], key: Callable[[T], str | None]) -> list[dict]:
+    """
+    Groups items by a key and returns the groups ordered by descending count.
+    """
+    counts = Counter(key(item) or "Unknown" for item in items)
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    ]
@@ -0,0 +1,286 @@
+from collections.abc import Callable, Iterator
+
+from censys_platform import SDK, models
+from pydantic import Field
+from soar_sdk.abstract import SOARClient
+from soar_sdk.action_results import ActionResult
+from soar_sdk.exceptions import ActionFailure
+from soar_sdk.logging import getLogger
+from soar_sdk.params import Param
+
+from ..accounting import BudgetExceededError, UsageMeter
+from ..cache import CredentialCache, ResponseCache
+from ..config import Asset
+from ..inputs import (
+    normalize_fingerprint,
+    normalize_inputs,
+    normalize_ip,
+    normalize_web_property,
+)
+from ..utils import create_censys_sdk
+from .action_output import (
+    CensysActionOutput,
+    CensysActionSummary,
+    success_results,
+)
+from .batching import (
+    RESOURCE_NAMES,
+    BatchLookups,
+    concurrency_field,
+    describe_error,
+    run_concurrently,
+)
+from .params import BudgetParams
+
+logger = getLogger()
+
+SEARCH_PAGE_SIZE = 100
+
+# Only the identifying fields of query hits are needed to build the watchlist
+QUERY_FIELDS = ["host.ip", "cert.fingerprint_sha256", "web.hostname", "web.port"]
+
+
+class WarmCacheActionParams(BudgetParams):
+    ips: str = Param(
+        default="",
+        required=False,
+        description="Comma-separated list of IPv4/IPv6 addresses of hosts to cache.",
+    )
+    fingerprints: str = Param(
+        default="",
+        required=False,
+        description="Comma-separated list of SHA256 fingerprints of certificates to cache.",
+    )
+    web_properties: str = Param(
+        default="",
+        required=False,
+        description="Comma-separated list of web properties to cache as hostname:port pairs, such as 'example.com:443'.",
+    )
+    query: str = Param(
+        default="",
+        required=False,
+        description="CenQL query whose matching hosts, certificates and web properties are also cached.",
+    )
+    max_query_results: int = Field(
+        default=100,
+        ge=1,
+        required=False,
+        description="The maximum number of query matches to cache.",
+    )
+    refresh_margin: int = Field(
+        default=600,
+        ge=0,
+        required=False,
+        description="Seconds before expiry within which cached entries are refreshed. Entries cached for longer than this are left as they are.",
+    )
+    concurrency: int = concurrency_field(
+        default=2, description="The number of batches to fetch at the same time."
+    )
+
+
+class WarmCacheActionOutput(CensysActionOutput):
+    resource_type: str
+    resource_id: str
+    source: str
+    status: str
+    error: str | None = None
+
+
+class WarmCacheActionSummary(CensysActionSummary):
+    indicator_count: int
+    cached_count: int
+    fresh_count: int
+    error_count: int
+
+
+def warm_cache(
+    params: WarmCacheActionParams,
+    asset: Asset,
+    soar: SOARClient[WarmCacheActionSummary],
+):
+    """
+    Fetches a watchlist of hosts, certificates and web properties into the response
+    cache, refreshing entries that are about to expire
+    """
+    response_cache = ResponseCache.for_asset(asset)
+    if not response_cache.enabled:
+        return ActionResult(
+            False,
+            "Please set the asset's 'response_cache_ttl' to a positive number of seconds to enable the response cache",
+            dict(params),
+        )
+
+    if not any(
+        p.strip()
+        for p in (params.ips, params.fingerprints, params.web_properties, params.query)
+    ):
+        return ActionResult(
+            False,
+            "Please provide at least one of the 'ips', 'fingerprints', 'web_properties' or 'query' action parameters",
+            dict(params),
+        )
+
+    meter = UsageMeter.for_run(asset, params.request_budget, params.credit_budget)
+    lookups = BatchLookups(CredentialCache.for_asset(asset))
+    outputs: dict[tuple[str, str], WarmCacheActionOutput] = {}
+
+    def add(
+        resource_type: str, resource_id: str, source: str, error: str | None = None
+    ) -> None:
+        if (resource_type, resource_id) not in outputs:
+            outputs[resource_type, resource_id] = WarmCacheActionOutput(
+                resource_type=resource_type,
+                resource_id=resource_id,
+                source=source,
+                status="pending" if error is None else "invalid",
+                error=error,
+            )
+
+    for resource_type, values in (
+        ("host", params.ips),
+        ("cert", params.fingerprints),
+        ("web", params.web_properties),
+    ):
+        indicators = normalize_inputs(values, NORMALIZERS[resource_type])
+        for rejected in indicators.rejected:
+            add(
+                resource_type,
+                rejected.value,
+                "input",
+                f"Invalid indicator: {rejected.reason}",
+            )
+        for resource_id in indicators.accepted:
+            add(resource_type, resource_id, "input")
+
+    with create_censys_sdk(asset, meter) as sdk:
+        if params.query.strip():
+            try:
+                for resource_type, value in search_indicators(
+                    sdk, params.query, params.max_query_results
+                ):
+                    try:
+                        resource_id = NORMALIZERS[resource_type](value)
+                    except ValueError as err:
+                        add(resource_type, value, "query", f"Invalid indicator: {err}")
+                        continue
+                    add(resource_type, resource_id, "query")
+            except models.SDKBaseError as err:
+                logger.error(err)
+                raise ActionFailure(
+                    f"Failed to execute search with status code: {err.status_code}"
+                ) from err
+            except BudgetExceededError as err:
+                logger.warning(f"Stopping search early: {err}")
+            except Exception as err:
+                logger.error(err)
+                raise ActionFailure(
+                    "Failed to execute search with generic error"
+                ) from err
+
+        batches: list[tuple[str, tuple[str, ...]]] = []
+        for resource_type in RESOURCE_NAMES:
+            pending = [
+                o.resource_id
+                for o in outputs.values()
+                if o.resource_type == resource_type and o.status == "pending"
+            ]
+            fresh = response_cache.fresh_ids(
+                resource_type, pending, params.refresh_margin
+            )
+            for resource_id in fresh:
+                outputs[resource_type, resource_id].status = "fresh"
+
+            batches.extend(
+                (resource_type, batch)
+                for batch in lookups.batches(i for i in pending if i not in fresh)
+            )
+
+        logger.info(f"Warming the response cache with {len(batches)} batch(es)")
+
+        for (resource_type, batch), found, err in run_concurrently(
+            lambda task: lookups.fetch(sdk, *task), batches, params.concurrency
+        ):
+            if err is not None:
+                logger.error(err)
+                for resource_id in batch:
+                    output = outputs[resource_type, resource_id]
+                    output.status = "failed"
+                    output.error = describe_error(RESOURCE_NAMES[resource_type], err)
+                continue
+
+            for resource_id in batch:
+                output = outputs[resource_type, resource_id]
+                resource = found.get(resource_id)
+                if resource is None:
+                    output.status = "not_found"
+                    continue
+
+                response_cache.put(resource_type, resource_id, resource)
+                output.status = "cached"
+
+    results = [
+        WarmCacheActionOutput.trusted(validate=asset.validate_outputs, **dict(output))
+        for output in outputs.values()
+    ]
+    cached_count = sum(r.status == "cached" for r in results)
+    fresh_count = sum(r.status == "fresh" for r in results)
+    error_count = len(results) - cached_count - fresh_count
+
+    soar.set_summary(
+        WarmCacheActionSummary(
+            indicator_count=len(results),
+            cached_count=cached_count,
+            fresh_count=fresh_count,
+            error_count=error_count,
+            **meter.summary_fields(),
+        )
+    )
+
+    message = f"Cached {cached_count:,} of {len(results):,} indicator(s); {fresh_count:,} were already fresh"
+    if error_count:
+        message += f"; {error_count:,} could not be cached"
+    soar.set_message(message)
+
+    return success_results(results, params, soar)
+
+
+def search_indicators(
+    sdk: SDK, query: str, max_results: int
+) -> Iterator[tuple[str, str]]:
+    """
+    Runs a CenQL query and yields the resource type and ID of up to `max_results` of
+    its matches. IDs are yielded as returned, and may be empty or malformed.
+    """
+    count = 0
+    page_token: str | None = None
+
+    while count < max_results:
+        data = sdk.global_data.search(
+            search_query_input_body=models.SearchQueryInputBody(
+                query=query,
+                page_size=min(SEARCH_PAGE_SIZE, max_results - count),
+                page_token=page_token,
+                fields=QUERY_FIELDS,
+            )
+        ).result.result
+
+        for hit in (data.hits or [])[: max_results - count]:
+            count += 1
+            if hit.host_v1 is not None:
+                yield "host", hit.host_v1.resource.ip or ""
+            elif hit.certificate_v1 is not None:
+                yield "cert", hit.certificate_v1.resource.fingerprint_sha256 or ""
+            elif hit.webproperty_v1 is not None:
+                web = hit.webproperty_v1.resource
+                yield "web", f"{web.hostname or ''}:{web.port or ''}"
+
+        page_token = data.next_page_token
+        if not page_token:
+            break
+
+
+NORMALIZERS: dict[str, Callable[[str], str]] = {
+    "host": normalize_ip,
+    "cert": normalize_fingerprint,
+    "web": normalize_web_property,
+}
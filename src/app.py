@@ -6,6 +6,7 @@ from soar_sdk.app import App
 from soar_sdk.logging import getLogger
 
 from .actions.registration import register_all_actions
+from .cache import CredentialCache
 from .config import Asset
 from .utils import create_censys_sdk, has_org_config
 
@@ -27,18 +28,26 @@ app = App(
 
 @app.test_connectivity()
 def test_connectivity(soar: SOARClient, asset: Asset) -> None:
+    credentials = CredentialCache.for_asset(asset)
     with create_censys_sdk(asset) as sdk:
         try:
+            # Use the cheapest call the credentials can make: neither returns asset
+            # data or costs credits
             if has_org_config(asset):
-                sdk.account_management.get_organization_details(
+                res = sdk.account_management.get_organization_details(
                     organization_id=asset.organization_id,
                     include_member_counts=False,
                 )
             else:
-                sdk.global_data.get_host(host_id="127.0.0.1")
-            return
+                res = sdk.global_data.convert_legacy_search_queries(
+                    search_convert_query_input_body=models.SearchConvertQueryInputBody(
+                        queries=["ip: 127.0.0.1"]
+                    )
+                )
         except models.SDKBaseError as err:
             logger.error(err)
+            if err.status_code in (401, 403):
+                credentials.invalidate()
             raise ActionFailure(
                 f"Connectivity test failed with status code {err.status_code}"
             ) from err
@@ -46,6 +55,26 @@ def test_connectivity(soar: SOARClient, asset: Asset) -> None:
             logger.error(err)
             raise ActionFailure("Connectivity test failed with generic error") from err
 
+    rate_limit = parse_rate_limit(res.headers)
+    if rate_limit is not None:
+        logger.info(
+            f"Credentials accepted with a rate limit of {rate_limit:,} requests"
+        )
+    credentials.record_validated(rate_limit)
+
+
+def parse_rate_limit(headers: dict[str, list[str]]) -> int | None:
+    """
+    Reads the request rate limit advertised by the API, if any.
+    """
+    for name, values in headers.items():
+        if name.lower() == "x-ratelimit-limit" and values:
+            try:
+                return int(values[0].split(",")[0].split(";")[0])
+            except ValueError:
+                return None
+    return None
+
 
 register_all_actions(app)
 
@@ -0,0 +1,404 @@
+import hashlib
+import os
+import sqlite3
+import stat
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+import censys_platform
+from pydantic import BaseModel, ValidationError
+from soar_sdk.logging import getLogger
+
+from .config import Asset
+from .serialization import to_json_bytes
+
+logger = getLogger()
+
+M = TypeVar("M", bound=BaseModel)
+
+# Shared by every action process the same user runs on the host, so concurrent runs
+# benefit from each other's results. Kept in a directory only that user may access,
+# as it holds API responses.
+DEFAULT_CACHE_PATH = (
+    Path(tempfile.gettempdir()) / f"censys_soar_{os.getuid()}" / "cache.sqlite3"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS negative_results (
+    key TEXT PRIMARY KEY,
+    status_code INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS credentials (
+    key TEXT PRIMARY KEY,
+    validated_at REAL,
+    batch_lookups INTEGER,
+    rate_limit INTEGER,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+@contextmanager
+def connect_cache(path: Path = DEFAULT_CACHE_PATH) -> Iterator[sqlite3.Connection]:
+    with closing(open_cache(path)) as conn:
+        yield conn
+
+
+def open_cache(
+    path: Path = DEFAULT_CACHE_PATH, *, setup: bool = True
+) -> sqlite3.Connection:
+    """
+    Opens a connection to the cache database, for the caller to close. Unless `setup`
+    is False, the file is first checked to be private and its tables are created, which
+    callers opening many short-lived connections only need to do once.
+    """
+    if setup:
+        _prepare_cache_file(path)
+
+    conn = sqlite3.connect(
+        path, timeout=5, isolation_level=None, check_same_thread=False
+    )
+    if setup:
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        except BaseException:
+            conn.close()
+            raise
+
+    return conn
+
+
+def credential_key(asset: Asset) -> str:
+    """
+    Hashes the asset's base URL, organization ID and token, so that cached entries are
+    only shared between runs that use the same credentials.
+    """
+    credentials = f"{asset.base_url}|{asset.organization_id or ''}|{asset.api_token}"
+    return hashlib.sha256(credentials.encode()).hexdigest()
+
+
+def _prepare_cache_file(path: Path) -> None:
+    """
+    Creates the cache file and its directory so that only the current user may access
+    them, and refuses to use either if it belongs to another user, who could otherwise
+    read or plant cached results. Raises `sqlite3.OperationalError`, like a failure to
+    open the database would, so that callers skip the cache.
+    """
+    try:
+        directory = path.parent
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if _check_private(directory, directory.stat()):
+            directory.chmod(0o700)
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+        try:
+            if _check_private(path, os.fstat(fd)):
+                os.fchmod(fd, 0o600)
+        finally:
+            os.close(fd)
+    except OSError as err:
+        raise sqlite3.OperationalError(f"Unable to use cache at {path}: {err}") from err
+
+
+def _check_private(path: Path, st: os.stat_result) -> bool:
+    """
+    Raises if another user owns `path`, and returns whether other users may access it.
+    """
+    if st.st_uid != os.getuid():
+        raise sqlite3.OperationalError(
+            f"Refusing to use cache at {path}: it is owned by another user"
+        )
+    return bool(stat.S_IMODE(st.st_mode) & 0o077)
+
+
+class NegativeCache:
+    """
+    Remembers lookups that failed with a not-found or invalid-resource status, so that
+    repeated lookups of the same resource fail fast without calling the API. Each
+    status code has its own TTL in seconds; statuses without a positive TTL are never
+    cached. Entries are keyed on the asset's credentials, as access to a resource may
+    differ between organizations. Cache errors are logged and otherwise ignored.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttls: dict[int, int],
+        path: Path = DEFAULT_CACHE_PATH,
+    ) -> None:
+        self.namespace = namespace
+        self.ttls = {status: ttl for status, ttl in ttls.items() if ttl > 0}
+        self.path = path
+
+    @classmethod
+    def for_asset(cls, asset: Asset) -> "NegativeCache":
+        return cls(
+            namespace=credential_key(asset),
+            ttls={
+                404: asset.not_found_cache_ttl,
+                422: asset.invalid_cache_ttl,
+            },
+        )
+
+    def get(self, resource_type: str, resource_id: str) -> int | None:
+        """
+        Returns the cached status code for a failed lookup, or None if there is none.
+        """
+        if not self.ttls:
+            return None
+
+        try:
+            with connect_cache(self.path) as conn:
+                row = conn.execute(
+                    "SELECT status_code FROM negative_results WHERE key = ? AND expires_at > ?",
+                    (self._key(resource_type, resource_id), time.time()),
+                ).fetchone()
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to read negative result cache: {err}")
+            return None
+
+        return row[0] if row else None
+
+    def put(self, resource_type: str, resource_id: str, status_code: int) -> None:
+        self.put_many(resource_type, {resource_id: status_code})
+
+    def put_many(self, resource_type: str, status_codes: dict[str, int]) -> None:
+        """
+        Records the failed lookups of many resources, keyed by resource ID, at once.
+        """
+        now = time.time()
+        rows = [
+            (self._key(resource_type, resource_id), status_code, now + ttl)
+            for resource_id, status_code in status_codes.items()
+            if (ttl := self.ttls.get(status_code)) is not None
+        ]
+        if not rows:
+            return
+
+        try:
+            with connect_cache(self.path) as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO negative_results (key, status_code, expires_at) VALUES (?, ?, ?)",
+                    rows,
+                )
+                conn.execute(
+                    "DELETE FROM negative_results WHERE expires_at <= ?", (now,)
+                )
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to write negative result cache: {err}")
+
+    def _key(self, resource_type: str, resource_id: str) -> str:
+        return f"{self.namespace}|{resource_type}|{resource_id}"
+
+
+class ResponseCache:
+    """
+    Keeps the latest data of successfully retrieved resources for a TTL, so that
+    repeated lookups, and lookups warmed up ahead of time by the `warm_cache` action,
+    are served without calling the API. Historical (`at_time`) lookups are never
+    cached. Entries are keyed on the asset's credentials, so that a resource is only
+    served to the organization and token that retrieved it. Cache errors are logged
+    and otherwise ignored.
+    """
+
+    def __init__(
+        self, namespace: str, ttl: int, path: Path = DEFAULT_CACHE_PATH
+    ) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.path = path
+
+    @classmethod
+    def for_asset(cls, asset: Asset) -> "ResponseCache":
+        return cls(namespace=credential_key(asset), ttl=asset.response_cache_ttl)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, resource_type: str, resource_id: str, model: type[M]) -> M | None:
+        """
+        Returns the cached resource, or None if there is none.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            with connect_cache(self.path) as conn:
+                row = conn.execute(
+                    "SELECT body FROM responses WHERE key = ? AND expires_at > ?",
+                    (self._key(resource_type, resource_id), time.time()),
+                ).fetchone()
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to read response cache: {err}")
+            return None
+
+        if row is None:
+            return None
+
+        try:
+            return model.model_validate_json(row[0])
+        except ValidationError as err:
+            logger.warning(f"Discarding unreadable response cache entry: {err}")
+            self.delete(resource_type, resource_id)
+            return None
+
+    def put(self, resource_type: str, resource_id: str, resource: BaseModel) -> None:
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            with connect_cache(self.path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, body, expires_at) VALUES (?, ?, ?)",
+                    (
+                        self._key(resource_type, resource_id),
+                        to_json_bytes(resource),
+                        now + self.ttl,
+                    ),
+                )
+                conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to write response cache: {err}")
+
+    def delete(self, resource_type: str, resource_id: str) -> None:
+        try:
+            with connect_cache(self.path) as conn:
+                conn.execute(
+                    "DELETE FROM responses WHERE key = ?",
+                    (self._key(resource_type, resource_id),),
+                )
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to write response cache: {err}")
+
+    def fresh_ids(
+        self, resource_type: str, resource_ids: list[str], min_ttl: float
+    ) -> set[str]:
+        """
+        Returns the given resources that are cached for at least another `min_ttl`
+        seconds.
+        """
+        if not self.enabled or not resource_ids:
+            return set()
+
+        keys = {self._key(resource_type, i): i for i in resource_ids}
+        try:
+            with connect_cache(self.path) as conn:
+                rows = conn.execute(
+                    f"SELECT key FROM responses WHERE expires_at > ? AND key IN ({', '.join('?' * len(keys))})",  # noqa: S608
+                    (time.time() + min_ttl, *keys),
+                ).fetchall()
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to read response cache: {err}")
+            return set()
+
+        return {keys[key] for (key,) in rows}
+
+    def _key(self, resource_type: str, resource_id: str) -> str:
+        # Responses cached by another SDK version may not fit its models
+        return f"{self.namespace}|{censys_platform.__version__}|{resource_type}|{resource_id}"
+
+
+@dataclass
+class CredentialState:
+    """
+    What is known about a set of API credentials: when the API last accepted them in a
+    connectivity test, and the entitlements discovered along the way. None means not
+    yet known.
+    """
+
+    validated_at: float | None = None
+    batch_lookups: bool | None = None
+    rate_limit: int | None = None
+
+
+class CredentialCache:
+    """
+    Remembers, for the asset's TTL, that the asset's credentials were accepted by the
+    API and which API paths they may use, so that actions can pick the fastest
+    supported path without probing for it first. Entries are keyed on a hash of the
+    credentials. Cache errors are logged and otherwise ignored.
+    """
+
+    def __init__(self, key: str, ttl: int, path: Path = DEFAULT_CACHE_PATH) -> None:
+        self.key = key
+        self.ttl = ttl
+        self.path = path
+
+    @classmethod
+    def for_asset(cls, asset: Asset) -> "CredentialCache":
+        return cls(key=credential_key(asset), ttl=asset.credential_cache_ttl)
+
+    def get(self) -> CredentialState:
+        if self.ttl <= 0:
+            return CredentialState()
+
+        try:
+            with connect_cache(self.path) as conn:
+                row = conn.execute(
+                    "SELECT validated_at, batch_lookups, rate_limit FROM credentials WHERE key = ? AND expires_at > ?",
+                    (self.key, time.time()),
+                ).fetchone()
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to read credential cache: {err}")
+            return CredentialState()
+
+        if row is None:
+            return CredentialState()
+
+        validated_at, batch_lookups, rate_limit = row
+        return CredentialState(
+            validated_at=validated_at,
+            batch_lookups=None if batch_lookups is None else bool(batch_lookups),
+            rate_limit=rate_limit,
+        )
+
+    def record_validated(self, rate_limit: int | None) -> None:
+        """
+        Records that the API just accepted the credentials, along with the rate limit
+        it advertised, keeping any entitlements already discovered.
+        """
+        self._update(validated_at=time.time(), rate_limit=rate_limit)
+
+    def record_batch_lookups(self, available: bool) -> None:
+        self._update(batch_lookups=int(available))
+
+    def invalidate(self) -> None:
+        try:
+            with connect_cache(self.path) as conn:
+                conn.execute("DELETE FROM credentials WHERE key = ?", (self.key,))
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to write credential cache: {err}")
+
+    def _update(self, **columns: float | None) -> None:
+        if self.ttl <= 0:
+            return
+
+        now = time.time()
+        names = ", ".join(columns)
+        placeholders = ", ".join("?" * len(columns))
+        # The given columns are overwritten and the others keep their cached value
+        assignments = ", ".join(f"{name} = excluded.{name}" for name in columns)
+        try:
+            with connect_cache(self.path) as conn:
+                conn.execute(
+                    f"INSERT INTO credentials (key, {names}, expires_at) VALUES (?, {placeholders}, ?) "  # noqa: S608
+                    f"ON CONFLICT (key) DO UPDATE SET {assignments}, expires_at = excluded.expires_at",
+                    (self.key, *columns.values(), now + self.ttl),
+                )
+                conn.execute("DELETE FROM credentials WHERE expires_at <= ?", (now,))
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to write credential cache: {err}")
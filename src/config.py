@@ -18,6 +18,56 @@ class Asset(BaseAsset):
         default=None,
         description="Organization ID for the organization you would like to act as",
     )
+    request_budget: int = AssetField(
+        default=0,
+        required=False,
+        description="Maximum number of API requests a single action run may make (0 for unlimited)",
+    )
+    credit_budget: float = AssetField(
+        default=0,
+        required=False,
+        description="Maximum number of credits a single action run may use (0 for unlimited)",
+    )
+    not_found_cache_ttl: int = AssetField(
+        default=300,
+        required=False,
+        description="Seconds to remember lookups that were not found (404) before asking the API again (0 to disable)",
+    )
+    invalid_cache_ttl: int = AssetField(
+        default=3600,
+        required=False,
+        description="Seconds to remember lookups of invalid resources (422) before asking the API again (0 to disable)",
+    )
+    response_cache_ttl: int = AssetField(
+        default=0,
+        required=False,
+        description="Seconds to serve the latest data of hosts, certificates and web properties from a local cache, as warmed up by the warm_cache action (0 to disable)",
+    )
+    credential_cache_ttl: int = AssetField(
+        default=3600,
+        required=False,
+        description="Seconds to remember that the credentials passed a connectivity test and which API features and rate limit they have (0 to disable)",
+    )
+    max_concurrent_requests: int = AssetField(
+        default=0,
+        required=False,
+        description="Maximum number of API requests in flight at once across all action runs on this host using these credentials (0 to use the rate limit found by the last connectivity test, if any)",
+    )
+    concurrency_wait_timeout: int = AssetField(
+        default=120,
+        required=False,
+        description="Seconds a request may wait for a free slot when max_concurrent_requests is set before the action fails",
+    )
+    stream_responses: bool = AssetField(
+        default=False,
+        required=False,
+        description="Parse large host, web property and search responses incrementally to reduce peak memory",
+    )
+    validate_outputs: bool = AssetField(
+        default=False,
+        required=False,
+        description="Debugging aid: fully re-validate action outputs instead of reusing the validated API models",
+    )
 
     @model_validator(mode="after")
     def validate_organization_id(self) -> Self:
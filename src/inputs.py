@@ -0,0 +1,172 @@
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from ipaddress import ip_address
+
+from .utils import is_valid_web_property_hostname
+
+# Common ways of defanging indicators so that they are not clickable, and their
+# replacements
+DEFANGED_PATTERNS = (
+    (re.compile(r"\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\)", re.IGNORECASE), "."),
+    (re.compile(r"\[:\]"), ":"),
+    (re.compile(r"\[://\]"), "://"),
+    (re.compile(r"^hxxp", re.IGNORECASE), "http"),
+)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+SEPARATORS = re.compile(r"[,\s]+")
+SCHEME_PATTERN = re.compile(r"^([a-z][a-z0-9+.-]*)://", re.IGNORECASE)
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass
+class RejectedInput:
+    value: str
+    reason: str
+
+
+@dataclass
+class InputBatch:
+    """
+    The result of normalizing a list of inputs: the distinct valid values in their
+    original order, and the invalid values with the reason each was rejected.
+    """
+
+    accepted: list[str] = field(default_factory=list)
+    rejected: list[RejectedInput] = field(default_factory=list)
+    duplicates: int = 0
+
+
+def normalize_inputs(
+    values: str | Iterable[str], normalize: Callable[[str], str]
+) -> InputBatch:
+    """
+    Normalizes a comma or whitespace separated string, or an iterable, of inputs in a
+    single pass. `normalize` returns the canonical form of one value or raises
+    `ValueError` describing what is wrong with it. Values that normalize to one already
+    seen are dropped.
+    """
+    if isinstance(values, str):
+        values = SEPARATORS.split(values)
+
+    batch = InputBatch()
+    seen: set[str] = set()
+    for raw in values:
+        value = raw.strip()
+        if not value:
+            continue
+
+        try:
+            normalized = normalize(value)
+        except ValueError as err:
+            batch.rejected.append(RejectedInput(value, str(err)))
+            continue
+
+        if normalized in seen:
+            batch.duplicates += 1
+            continue
+
+        seen.add(normalized)
+        batch.accepted.append(normalized)
+
+    return batch
+
+
+def refang(value: str) -> str:
+    """
+    Reverses common indicator defanging, such as `1.2.3[.]4` or `hxxps://`.
+    """
+    value = value.strip()
+    for pattern, replacement in DEFANGED_PATTERNS:
+        value = pattern.sub(replacement, value)
+    return value
+
+
+def normalize_ip(value: str) -> str:
+    """
+    Returns the canonical form of an IP address, with IPv6 addresses compressed.
+    """
+    value = refang(value).removeprefix("[").removesuffix("]")
+    try:
+        return str(ip_address(value))
+    except ValueError:
+        raise ValueError("expected an IPv4 or IPv6 address") from None
+
+
+def normalize_fingerprint(value: str) -> str:
+    """
+    Returns a SHA256 fingerprint as lowercase hex, accepting colon-separated bytes.
+    """
+    value = value.strip().replace(":", "").lower()
+    if not SHA256_PATTERN.match(value):
+        raise ValueError("expected a SHA256 fingerprint of 64 hex characters")
+    return value
+
+
+def normalize_hostname(value: str) -> str:
+    """
+    Returns a lowercased domain name without a trailing dot, or a canonical IP address.
+    """
+    value = refang(value).lower().rstrip(".")
+    try:
+        return normalize_ip(value)
+    except ValueError:
+        pass
+
+    if not is_valid_web_property_hostname(value):
+        raise ValueError("expected a domain name or IP address")
+    return value
+
+
+def normalize_web_property(value: str) -> str:
+    """
+    Returns a web property ID as `hostname:port`. URLs are reduced to their host and
+    port, using the scheme's default port when none is given.
+    """
+    value = refang(value)
+    default_port: int | None = None
+    if scheme := SCHEME_PATTERN.match(value):
+        default_port = DEFAULT_PORTS.get(scheme.group(1).lower())
+        value = re.split(r"[/?#]", value[scheme.end() :], maxsplit=1)[0]
+
+    if value.startswith("["):
+        hostname, _, port = value[1:].partition("]")
+        port = port.removeprefix(":") or str(default_port or "")
+    elif ":" in value:
+        hostname, _, port = value.rpartition(":")
+    elif default_port is not None:
+        hostname, port = value, str(default_port)
+    else:
+        raise ValueError(
+            "expected a domain name or IP address and a port, such as 'example.com:443'"
+        )
+
+    if not port.isdigit() or not 1 <= int(port) <= 65535:
+        raise ValueError("the port must be a number between 1 and 65535")
+
+    try:
+        hostname = normalize_hostname(hostname)
+    except ValueError:
+        raise ValueError(
+            "expected a domain name or IP address and a port, such as 'example.com:443'"
+        ) from None
+
+    return f"{hostname}:{int(port)}"
+
+
+def normalize_at_time(value: str) -> str:
+    """
+    Returns an ISO 8601 timestamp in UTC. Timestamps without a timezone are taken to
+    be in UTC already.
+    """
+    try:
+        at_time = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError("expected an ISO 8601 timestamp") from None
+
+    if at_time.tzinfo is None:
+        at_time = at_time.replace(tzinfo=UTC)
+    return at_time.astimezone(UTC).isoformat().replace("+00:00", "Z")
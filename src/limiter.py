@@ -0,0 +1,294 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from soar_sdk.logging import getLogger
+
+from .cache import DEFAULT_CACHE_PATH, CredentialCache, credential_key, open_cache
+from .config import Asset
+
+logger = getLogger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS limiter_queue (
+    ticket INTEGER PRIMARY KEY AUTOINCREMENT,
+    namespace TEXT NOT NULL,
+    token TEXT NOT NULL UNIQUE,
+    heartbeat REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS limiter_queue_namespace ON limiter_queue (namespace, ticket);
+CREATE TABLE IF NOT EXISTS limiter_slots (
+    token TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS limiter_slots_namespace ON limiter_slots (namespace);
+"""
+
+# A slot held for longer than this is assumed to be leaked and is reclaimed
+DEFAULT_LEASE_SECONDS = 300
+# Waiters refresh their heartbeat on every poll; silent ones have gone away
+STALE_WAITER_SECONDS = 10
+MIN_POLL_SECONDS = 0.01
+MAX_POLL_SECONDS = 0.25
+
+
+class ConcurrencyLimitTimeout(Exception):
+    """
+    Raised when a request waited longer than the asset's timeout for an API slot.
+    """
+
+
+@dataclass
+class HeldSlot:
+    """
+    A slot taken by `ConcurrencyLimiter.acquire`, with the connection that releases it.
+    """
+
+    token: str
+    conn: sqlite3.Connection
+
+
+class ConcurrencyLimiter:
+    """
+    A counting semaphore shared by every action process on the host, bounding the
+    number of API requests in flight for one asset. Waiters are served in arrival
+    order. Slots held by processes that have exited, or for longer than the lease, are
+    reclaimed. Errors from the shared database are logged and let the request through.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_in_flight: int,
+        timeout: float,
+        path: Path = DEFAULT_CACHE_PATH,
+        lease: float = DEFAULT_LEASE_SECONDS,
+    ) -> None:
+        self.namespace = namespace
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.path = path
+        self.lease = lease
+        # Whether the database file has been checked and the tables created
+        self._ready = False
+
+    @classmethod
+    def for_asset(cls, asset: Asset) -> "ConcurrencyLimiter | None":
+        """
+        Returns the limiter for the asset's API credentials, or None when the asset does
+        not limit concurrency. Without a limit of its own, the asset is held to the rate
+        limit the API advertised when the credentials last passed a connectivity test.
+        """
+        max_in_flight = asset.max_concurrent_requests
+        if max_in_flight <= 0:
+            max_in_flight = CredentialCache.for_asset(asset).get().rate_limit or 0
+        if max_in_flight <= 0:
+            return None
+
+        return cls(
+            namespace=credential_key(asset),
+            max_in_flight=max_in_flight,
+            timeout=asset.concurrency_wait_timeout,
+        )
+
+    def acquire(self) -> HeldSlot | None:
+        """
+        Waits for a free slot and returns it, to be passed to `release`.
+        """
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.timeout
+        delay = MIN_POLL_SECONDS
+
+        try:
+            conn = self._connect()
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to acquire API request slot: {err}")
+            return None
+
+        try:
+            conn.execute(
+                "INSERT INTO limiter_queue (namespace, token, heartbeat) VALUES (?, ?, ?)",
+                (self.namespace, token, time.time()),
+            )
+
+            try:
+                while not self._try_acquire(conn, token):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise ConcurrencyLimitTimeout(
+                            f"Timed out after {self.timeout:,}s waiting for one of {self.max_in_flight} API request slot(s)"
+                        )
+                    time.sleep(min(delay, remaining))
+                    delay = min(delay * 2, MAX_POLL_SECONDS)
+            except BaseException:
+                conn.execute("DELETE FROM limiter_queue WHERE token = ?", (token,))
+                raise
+        except sqlite3.Error as err:
+            conn.close()
+            # Set the database up again next time, in case it was removed
+            self._ready = False
+            logger.warning(f"Failed to acquire API request slot: {err}")
+            return None
+        except BaseException:
+            conn.close()
+            raise
+
+        return HeldSlot(token, conn)
+
+    def release(self, slot: HeldSlot | None) -> None:
+        if slot is None:
+            return
+
+        try:
+            slot.conn.execute(
+                "DELETE FROM limiter_slots WHERE token = ?", (slot.token,)
+            )
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to release API request slot: {err}")
+        finally:
+            slot.conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the connection for one acquire and release cycle. Only the limiter's
+        first connection checks the database file and creates the tables.
+        """
+        if self._ready:
+            return open_cache(self.path, setup=False)
+
+        conn = open_cache(self.path)
+        try:
+            conn.executescript(_SCHEMA)
+        except BaseException:
+            conn.close()
+            raise
+
+        self._ready = True
+        return conn
+
+    def _try_acquire(self, conn: sqlite3.Connection, token: str) -> bool:
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._reclaim(conn, now)
+            conn.execute(
+                "UPDATE limiter_queue SET heartbeat = ? WHERE token = ?", (now, token)
+            )
+
+            (in_flight,) = conn.execute(
+                "SELECT COUNT(*) FROM limiter_slots WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+            # Only the longest-waiting requests may take the free slots
+            first_waiters = conn.execute(
+                "SELECT token FROM limiter_queue WHERE namespace = ? ORDER BY ticket LIMIT ?",
+                (self.namespace, max(self.max_in_flight - in_flight, 0)),
+            ).fetchall()
+
+            acquired = (token,) in first_waiters
+            if acquired:
+                conn.execute("DELETE FROM limiter_queue WHERE token = ?", (token,))
+                conn.execute(
+                    "INSERT INTO limiter_slots (token, namespace, pid, expires_at) VALUES (?, ?, ?, ?)",
+                    (token, self.namespace, os.getpid(), now + self.lease),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return acquired
+
+    def _reclaim(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM limiter_slots WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "DELETE FROM limiter_queue WHERE heartbeat <= ?",
+            (now - STALE_WAITER_SECONDS,),
+        )
+
+        pids = conn.execute(
+            "SELECT DISTINCT pid FROM limiter_slots WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchall()
+        for (pid,) in pids:
+            if not _is_process_alive(pid):
+                conn.execute("DELETE FROM limiter_slots WHERE pid = ?", (pid,))
+
+
+def _is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class LimitedTransport(httpx.BaseTransport):
+    """
+    Holds a `ConcurrencyLimiter` slot for each request, from before it is sent until
+    its response body has been read and closed.
+    """
+
+    def __init__(
+        self, transport: httpx.BaseTransport, limiter: ConcurrencyLimiter
+    ) -> None:
+        self._transport = transport
+        self._limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        release = _once(self._limiter.release, self._limiter.acquire())
+
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            release()
+            raise
+
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+def _once(
+    release: Callable[[HeldSlot | None], None], slot: HeldSlot | None
+) -> Callable:
+    lock = threading.Lock()
+    released = False
+
+    def release_once() -> None:
+        nonlocal released
+        with lock:
+            if released:
+                return
+            released = True
+        release(slot)
+
+    return release_once
@@ -0,0 +1,76 @@
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from functools import cache
+from typing import Any
+
+from censys_platform.types import UNSET
+from pydantic import BaseModel
+
+_Unset = type(UNSET)
+
+# Leaf values returned as they are, checked by exact type before anything else
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+@cache
+def _field_plan(model: type[BaseModel]) -> tuple[tuple[str, str, bool], ...]:
+    return tuple(
+        (name, field.serialization_alias or field.alias or name, field.is_required())
+        for name, field in model.model_fields.items()
+        if not field.exclude
+    )
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Converts action outputs and the Censys SDK models they hold into plain dicts and
+    lists keyed by field alias, like `model_dump(by_alias=True)`. The SDK's models
+    each run a Python serializer to drop unset fields, which dominates the cost of
+    dumping large hosts and search results; this walks the fields directly instead.
+    Unset fields, and optional fields that are None, are omitted.
+    """
+    if type(value) in _SCALAR_TYPES:
+        return value
+
+    if isinstance(value, BaseModel):
+        fields = value.__dict__
+        data: dict[str, Any] = {}
+        for name, key, required in _field_plan(type(value)):
+            item = fields.get(name)
+            if item is None:
+                if required:
+                    data[key] = None
+            elif not isinstance(item, _Unset):
+                data[key] = to_jsonable(item)
+        return data
+
+    if isinstance(value, list | tuple):
+        return [to_jsonable(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+
+    return value
+
+
+def to_json_bytes(value: Any) -> bytes:
+    """
+    Serializes a value as `to_jsonable` does into compact JSON with sorted keys, so
+    that equal values always produce the same bytes.
+    """
+    return json.dumps(
+        to_jsonable(value),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default,
+    ).encode()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime | date | time):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,333 @@
+import re
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import NoReturn
+
+import httpx
+from censys_platform import SDK, models, utils
+from censys_platform._hooks import HookContext
+from censys_platform.utils.unmarshal_json_response import unmarshal_json_response
+from pydantic import BaseModel
+
+from .accounting import STREAMING_EXTENSION, UsageMeter
+
+_STRUCTURAL = re.compile(rb'[\[\]{}:,"]')
+_STRING_REST = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+class JsonArrayScanner:
+    """
+    Incrementally scans a JSON document for the array of objects found under `path`
+    (a sequence of object keys from the document root). Each array item is yielded as
+    raw JSON bytes as soon as it is complete, so that only one item needs to be held in
+    memory at a time. Everything else is kept in `skeleton`, which is the document with
+    the array emptied.
+    """
+
+    def __init__(self, path: Iterable[str]) -> None:
+        self._path = [key.encode() for key in path]
+        self._stack: list[list] = []
+        self._last_string = b""
+        self._buf = bytearray()
+        self._pos = 0
+        self._flushed = 0
+        self._array_depth: int | None = None
+        self._item_start: int | None = None
+        self._found = False
+        self.skeleton = bytearray()
+
+    def iter_items(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+        if self._item_start is not None or self._stack:
+            raise ValueError("Truncated JSON document")
+
+        self.skeleton += self._buf[self._flushed :]
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        buf = self._buf
+        buf += chunk
+        items: list[bytes] = []
+        pos = self._pos
+
+        while (match := _STRUCTURAL.search(buf, pos)) is not None:
+            i = match.start()
+            char = buf[i : i + 1]
+
+            if char == b'"':
+                end = _STRING_REST.match(buf, i + 1)
+                if end is None:
+                    # Wait for the rest of the string
+                    pos = i
+                    break
+                if self._array_depth is None:
+                    self._last_string = bytes(buf[i + 1 : end.end() - 1])
+                pos = end.end()
+                continue
+
+            pos = i + 1
+            in_array = self._array_depth is not None
+
+            if char == b":":
+                self._stack[-1][1] = self._last_string
+            elif char in (b"{", b"["):
+                if in_array and len(self._stack) == self._array_depth:
+                    self._item_start = i
+                    self.skeleton += buf[self._flushed : i]
+                    self._flushed = i
+                elif char == b"[" and not in_array and self._is_target():
+                    self._array_depth = len(self._stack) + 1
+                self._stack.append([char, None])
+            elif char in (b"}", b"]"):
+                self._stack.pop()
+                if in_array and len(self._stack) < self._array_depth:
+                    self._end_item(buf, i, items)
+                    self._array_depth = None
+                    self._found = True
+            elif char == b"," and in_array and len(self._stack) == self._array_depth:
+                self._end_item(buf, i, items)
+                self._flushed = i + 1
+
+        keep_from = self._item_start if self._item_start is not None else pos
+        if self._item_start is None:
+            self.skeleton += buf[self._flushed : pos]
+
+        del buf[:keep_from]
+        self._pos = pos - keep_from
+        self._flushed = 0
+        if self._item_start is not None:
+            self._item_start = 0
+
+        return items
+
+    def _end_item(self, buf: bytearray, end: int, items: list[bytes]) -> None:
+        if self._item_start is None:
+            return
+
+        items.append(bytes(buf[self._item_start : end]))
+        self._item_start = None
+        self._flushed = end
+
+    def _is_target(self) -> bool:
+        return (
+            not self._found
+            and len(self._stack) == len(self._path)
+            and all(
+                kind == b"{" and key == expected
+                for (kind, key), expected in zip(self._stack, self._path, strict=True)
+            )
+        )
+
+
+# Status codes the SDK's own methods retry when a retry configuration is set
+_RETRY_STATUS_CODES = ["429", "500", "502", "503", "504"]
+
+
+@contextmanager
+def open_stream(
+    sdk: SDK,
+    meter: UsageMeter | None,
+    operation_id: str,
+    method: str,
+    path: str,
+    *,
+    accept: str,
+    request: BaseModel,
+    request_globals: BaseModel,
+    body: BaseModel | None = None,
+) -> Iterator[Iterator[bytes]]:
+    """
+    Sends a Platform API request as the SDK method for `operation_id` does, and yields
+    the response body in chunks instead of buffering it. The request is built, hooked
+    and retried by the SDK itself, through the same internal helpers its generated
+    methods use, and errors are raised as the same exceptions.
+    """
+    endpoints = sdk.global_data
+    config = sdk.sdk_configuration
+    base_url = endpoints._get_url(None, None)
+
+    http_request = endpoints._build_request(
+        method=method,
+        path=path,
+        base_url=base_url,
+        url_variables=None,
+        request=request,
+        request_body_required=body is not None,
+        request_has_path_params=True,
+        request_has_query_params=True,
+        user_agent_header="user-agent",
+        accept_header_value=accept,
+        _globals=request_globals,
+        security=config.security,
+        get_serialized_body=(
+            (
+                lambda: utils.serialize_request_body(
+                    body, False, False, "json", type(body)
+                )
+            )
+            if body is not None
+            else None
+        ),
+        timeout_ms=config.timeout_ms,
+    )
+    http_request.extensions[STREAMING_EXTENSION] = True
+
+    retry_config = None
+    if isinstance(config.retry_config, utils.RetryConfig):
+        retry_config = (config.retry_config, _RETRY_STATUS_CODES)
+
+    response = endpoints.do_request(
+        hook_ctx=HookContext(
+            config=config,
+            base_url=base_url or "",
+            operation_id=operation_id,
+            oauth2_scopes=None,
+            security_source=config.security,
+        ),
+        request=http_request,
+        error_status_codes=["4XX", "5XX"],
+        stream=True,
+        retry_config=retry_config,
+    )
+
+    try:
+        if response.status_code != 200:
+            response.read()
+            if meter is not None:
+                meter.record_bytes(len(response.content))
+            _raise_error(response)
+
+        yield _metered_chunks(response, meter)
+    finally:
+        response.close()
+
+
+def _raise_error(response: httpx.Response) -> NoReturn:
+    """
+    Raises the exception that the SDK's methods raise for an error response.
+    """
+    if utils.match_response(response, "401", "application/json"):
+        raise models.AuthenticationError(
+            unmarshal_json_response(models.AuthenticationErrorData, response), response
+        )
+    if utils.match_response(response, ["403", "404"], "application/problem+json"):
+        raise models.ErrorModel(
+            unmarshal_json_response(models.ErrorModelData, response), response
+        )
+    raise models.SDKError("API error occurred", response, response.text)
+
+
+def _metered_chunks(
+    response: httpx.Response, meter: UsageMeter | None
+) -> Iterator[bytes]:
+    for chunk in response.iter_bytes():
+        if meter is not None:
+            meter.record_bytes(len(chunk))
+        yield chunk
+
+
+def stream_host(
+    sdk: SDK,
+    meter: UsageMeter | None,
+    host_id: str,
+    at_time: str | None = None,
+) -> models.Host:
+    """
+    Retrieves a host, validating its services one at a time as they are received.
+    """
+    scanner = JsonArrayScanner(("result", "resource", "services"))
+
+    with open_stream(
+        sdk,
+        meter,
+        "v3-globaldata-asset-host",
+        "GET",
+        "/v3/global/asset/host/{host_id}",
+        accept="application/vnd.censys.api.v3.host.v1+json",
+        request=models.V3GlobaldataAssetHostRequest(host_id=host_id, at_time=at_time),
+        request_globals=models.V3GlobaldataAssetHostGlobals(
+            organization_id=sdk.sdk_configuration.globals.organization_id
+        ),
+    ) as chunks:
+        services = [
+            models.Service.model_validate_json(item)
+            for item in scanner.iter_items(chunks)
+        ]
+
+    host = models.ResponseEnvelopeHostAsset.model_validate_json(
+        scanner.skeleton
+    ).result.resource
+    host.services = services
+    return host
+
+
+def stream_web_property(
+    sdk: SDK,
+    meter: UsageMeter | None,
+    webproperty_id: str,
+    at_time: str | None = None,
+) -> models.Webproperty:
+    """
+    Retrieves a web property, validating its endpoints one at a time as they are
+    received.
+    """
+    scanner = JsonArrayScanner(("result", "resource", "endpoints"))
+
+    with open_stream(
+        sdk,
+        meter,
+        "v3-globaldata-asset-webproperty",
+        "GET",
+        "/v3/global/asset/webproperty/{webproperty_id}",
+        accept="application/vnd.censys.api.v3.webproperty.v1+json",
+        request=models.V3GlobaldataAssetWebpropertyRequest(
+            webproperty_id=webproperty_id, at_time=at_time
+        ),
+        request_globals=models.V3GlobaldataAssetWebpropertyGlobals(
+            organization_id=sdk.sdk_configuration.globals.organization_id
+        ),
+    ) as chunks:
+        endpoints = [
+            models.EndpointScanState.model_validate_json(item)
+            for item in scanner.iter_items(chunks)
+        ]
+
+    web = models.ResponseEnvelopeWebpropertyAsset.model_validate_json(
+        scanner.skeleton
+    ).result.resource
+    web.endpoints = endpoints
+    return web
+
+
+def stream_search(
+    sdk: SDK,
+    meter: UsageMeter | None,
+    body: models.SearchQueryInputBody,
+    on_hit: Callable[[models.SearchQueryHit], None],
+) -> models.SearchQueryResponse:
+    """
+    Runs one search page, handing each hit to `on_hit` as soon as it is received. The
+    returned response carries the page metadata, without hits.
+    """
+    scanner = JsonArrayScanner(("result", "hits"))
+
+    with open_stream(
+        sdk,
+        meter,
+        "v3-globaldata-search-query",
+        "POST",
+        "/v3/global/search/query",
+        accept="application/json",
+        request=models.V3GlobaldataSearchQueryRequest(search_query_input_body=body),
+        request_globals=models.V3GlobaldataSearchQueryGlobals(
+            organization_id=sdk.sdk_configuration.globals.organization_id
+        ),
+        body=body,
+    ) as chunks:
+        for item in scanner.iter_items(chunks):
+            on_hit(models.SearchQueryHit.model_validate_json(item))
+
+    return models.ResponseEnvelopeSearchQueryResponse.model_validate_json(
+        scanner.skeleton
+    ).result
@@ -1,12 +1,16 @@
-from datetime import datetime
+from collections.abc import Iterator
+from contextlib import contextmanager
 from ipaddress import ip_address
 from typing import TypeVar
 
+import httpx
 from censys_platform import SDK
 
 from soar_sdk.logging import getLogger
 
+from .accounting import UsageMeter
 from .config import Asset
+from .limiter import ConcurrencyLimiter, LimitedTransport
 
 logger = getLogger()
 
@@ -15,20 +19,37 @@ def has_org_config(asset: Asset) -> bool:
     return asset.organization_id is not None and str(asset.organization_id) != ""
 
 
-def create_censys_sdk(asset: Asset) -> SDK:
+@contextmanager
+def create_censys_sdk(asset: Asset, meter: UsageMeter | None = None) -> Iterator[SDK]:
     """
-    Creates a pre-configured Censys SDK instance.
+    Creates a pre-configured Censys SDK instance. When a `UsageMeter` is given, every
+    request made through the SDK is counted and checked against the run's budgets. When
+    the asset limits concurrency, every request first waits for a host-wide slot.
     """
     logger.debug(
         f"Creating Censys SDK with{' no' if not has_org_config(asset) else ''} org ID"
     )
 
-    return SDK(
-        organization_id=asset.organization_id,
-        personal_access_token=asset.api_token,
-        server_url=asset.base_url,
+    limiter = ConcurrencyLimiter.for_asset(asset)
+    client = httpx.Client(
+        follow_redirects=True,
+        event_hooks=meter.event_hooks() if meter is not None else None,
+        transport=LimitedTransport(httpx.HTTPTransport(), limiter)
+        if limiter is not None
+        else None,
     )
 
+    with (
+        client,
+        SDK(
+            organization_id=asset.organization_id,
+            personal_access_token=asset.api_token,
+            server_url=asset.base_url,
+            client=client,
+        ) as sdk,
+    ):
+        yield sdk
+
 
 def is_valid_ip(value: str) -> bool:
     try:
@@ -51,17 +72,6 @@ def is_valid_web_property_hostname(value: str) -> bool:
     return len(parts) > 1 and all(len(p) > 0 for p in parts)
 
 
-def is_valid_at_time(value: str) -> bool:
-    """
-    Validates that the given input is a valid ISO 8601 timestamp.
-    """
-    try:
-        datetime.fromisoformat(value)
-        return True
-    except ValueError:
-        return False
-
-
 T = TypeVar("T")
 
 
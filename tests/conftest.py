@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+import pytest
+from censys_platform import models
+from soar_sdk.models.view import ViewContext
+
+# Recorded API responses, shared with the load test stub server
+PAYLOADS_DIR = Path(__file__).parent.parent / "loadtest" / "payloads"
+
+
+def load_payload(name: str) -> dict:
+    return json.loads((PAYLOADS_DIR / f"{name}.json").read_text())["result"]
+
+
+@pytest.fixture
+def host() -> models.Host:
+    return models.Host.model_validate(load_payload("host")["resource"])
+
+
+@pytest.fixture
+def cert() -> models.Certificate:
+    return models.Certificate.model_validate(load_payload("certificate")["resource"])
+
+
+@pytest.fixture
+def web() -> models.Webproperty:
+    return models.Webproperty.model_validate(load_payload("webproperty")["resource"])
+
+
+@pytest.fixture
+def search_response() -> models.SearchQueryResponse:
+    return models.SearchQueryResponse.model_validate(load_payload("search"))
+
+
+@pytest.fixture
+def view_context():
+    def make(**query: str) -> ViewContext:
+        return ViewContext(
+            QS={name: [value] for name, value in query.items()},
+            container=1,
+            app=1,
+            no_connection=False,
+            google_maps_key=False,
+        )
+
+    return make
@@ -0,0 +1,192 @@
+import pytest
+
+from src.actions.action_output import success_results
+from src.actions.columnar import ColumnarHitsBuilder, parse_columns
+from src.actions.lookup_cert import GetCertActionOutput
+from src.actions.lookup_host import GetHostActionOutput, get_last_scanned_at
+from src.actions.lookup_ip_range import LookupIpRangeActionOutput
+from src.actions.lookup_web_properties import (
+    LookupWebPropertiesActionOutput,
+    LookupWebPropertiesActionParams,
+    LookupWebPropertiesActionSummary,
+)
+from src.actions.lookup_web_property import GetWebPropertyActionOutput
+from src.actions.search import SearchActionOutput
+from src.actions.warm_cache import WarmCacheActionOutput
+
+
+def lookup_host(fixture):
+    host = fixture("host")
+    return GetHostActionOutput, {
+        "host": host,
+        "is_truncated_host": False,
+        "scan_time": get_last_scanned_at(host),
+    }
+
+
+def lookup_cert(fixture):
+    return GetCertActionOutput, {"cert": fixture("cert"), "display_name": "example"}
+
+
+def lookup_web_property(fixture):
+    return GetWebPropertyActionOutput, {"web": fixture("web")}
+
+
+def lookup_web_properties_found(fixture):
+    web = fixture("web")
+    return LookupWebPropertiesActionOutput, {
+        "target": f"{web.hostname}:{web.port}",
+        "source": "input",
+        "found": True,
+        "web": web,
+    }
+
+
+def lookup_web_properties_error(_fixture):
+    return LookupWebPropertiesActionOutput, {
+        "target": "example.com:8443",
+        "source": "expand",
+        "found": False,
+        "error": "Web property not found",
+    }
+
+
+def lookup_ip_range(fixture):
+    return LookupIpRangeActionOutput, {
+        "ip_range": "192.0.2.0/24",
+        "host_count": 1,
+        "hosts": [fixture("host")],
+    }
+
+
+def search(fixture):
+    response = fixture("search_response")
+    return SearchActionOutput, {
+        "hits": response.hits,
+        "query_duration_millis": response.query_duration_millis,
+        "total_hits": response.total_hits,
+    }
+
+
+def search_compact(fixture):
+    response = fixture("search_response")
+    columnar = ColumnarHitsBuilder(parse_columns(""))
+    columnar.add_hits(response.hits)
+    return SearchActionOutput, {
+        "hits": [],
+        "compact": columnar.build(),
+        "query_duration_millis": response.query_duration_millis,
+        "total_hits": response.total_hits,
+    }
+
+
+def warm_cache(_fixture):
+    return WarmCacheActionOutput, {
+        "resource_type": "host",
+        "resource_id": "192.0.2.1",
+        "source": "input",
+        "status": "failed",
+        "error": "Failed to retrieve with status code: 500",
+    }
+
+
+OUTPUTS = [
+    lookup_host,
+    lookup_cert,
+    lookup_web_property,
+    lookup_web_properties_found,
+    lookup_web_properties_error,
+    lookup_ip_range,
+    search,
+    search_compact,
+    warm_cache,
+]
+
+
+@pytest.mark.parametrize("build", OUTPUTS, ids=lambda build: build.__name__)
+def test_trusted_output_dumps_like_validated_output(build, request):
+    output_cls, data = build(request.getfixturevalue)
+
+    trusted = output_cls.trusted(**data)
+    validated = output_cls.trusted(validate=True, **data)
+
+    assert type(trusted) is type(validated) is output_cls
+    assert trusted.model_dump(by_alias=True) == validated.model_dump(by_alias=True)
+
+
+@pytest.mark.parametrize("build", OUTPUTS, ids=lambda build: build.__name__)
+def test_trusted_output_keeps_values(build, request):
+    output_cls, data = build(request.getfixturevalue)
+
+    trusted = output_cls.trusted(**data)
+
+    for name, value in data.items():
+        assert getattr(trusted, name) is value
+
+
+def _without_none(value):
+    if isinstance(value, dict):
+        return {k: _without_none(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_without_none(v) for v in value]
+    return value
+
+
+@pytest.mark.parametrize("build", OUTPUTS, ids=lambda build: build.__name__)
+def test_result_data_matches_model_dump(build, request):
+    output_cls, data = build(request.getfixturevalue)
+
+    output = output_cls.trusted(validate=True, **data)
+
+    assert output.to_result_data() == _without_none(output.model_dump(by_alias=True))
+
+
+class _Soar:
+    def __init__(self, summary=None, message=None):
+        self.summary = summary
+        self.message = message
+
+    def get_summary(self):
+        return self.summary
+
+    def get_message(self):
+        return self.message
+
+
+def test_success_results_carry_data_summary_and_message(web):
+    params = LookupWebPropertiesActionParams(targets="example.com:443")
+    summary = LookupWebPropertiesActionSummary(
+        target_count=2, found_count=2, error_count=0, expanded_count=0
+    )
+    soar = _Soar(summary, "Found 2 web properties")
+    outputs = [
+        LookupWebPropertiesActionOutput.trusted(
+            target=f"{web.hostname}:{web.port}", source="input", found=True, web=web
+        )
+        for _ in range(2)
+    ]
+
+    results = success_results(outputs, params, soar)
+
+    assert len(results) == 2
+    for output, result in zip(outputs, results, strict=True):
+        assert result.get_status() is True
+        assert result.get_message() == "Found 2 web properties"
+        assert result.get_param() == params.model_dump()
+        assert result.get_data() == [output.to_result_data()]
+        assert result.get_summary() == summary.model_dump(by_alias=True)
+
+
+def test_success_results_without_outputs_report_summary():
+    params = LookupWebPropertiesActionParams()
+    summary = LookupWebPropertiesActionSummary(
+        target_count=0, found_count=0, error_count=0, expanded_count=0
+    )
+
+    results = success_results([], params, _Soar(summary, "Nothing to look up"))
+
+    assert len(results) == 1
+    assert results[0].get_status() is True
+    assert results[0].get_data() == []
+    assert results[0].get_summary() == summary.model_dump(by_alias=True)
+    assert results[0].get_message() == "Nothing to look up"
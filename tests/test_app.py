@@ -0,0 +1,73 @@
+import contextlib
+import uuid
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from censys_platform import models
+from soar_sdk.exceptions import ActionFailure
+
+from src import app as app_module
+from src.app import parse_rate_limit
+from src.cache import CredentialCache
+from src.config import Asset
+
+
+@pytest.fixture
+def asset() -> Asset:
+    return Asset(api_token="token", organization_id=str(uuid.uuid4()))
+
+
+@pytest.fixture
+def credentials(mocker, tmp_path) -> CredentialCache:
+    credentials = CredentialCache("key", 60, tmp_path / "cache.sqlite3")
+    mocker.patch.object(CredentialCache, "for_asset", return_value=credentials)
+    return credentials
+
+
+@pytest.fixture
+def sdk(mocker):
+    sdk = mocker.MagicMock()
+    mocker.patch.object(
+        app_module, "create_censys_sdk", return_value=contextlib.nullcontext(sdk)
+    )
+    return sdk
+
+
+def test_connectivity_records_validated_credentials(mocker, asset, credentials, sdk):
+    sdk.account_management.get_organization_details.return_value = SimpleNamespace(
+        headers={"X-RateLimit-Limit": ["10"]}
+    )
+
+    app_module.test_connectivity.__wrapped__(mocker.MagicMock(), asset)
+
+    state = credentials.get()
+    assert state.validated_at is not None
+    assert state.rate_limit == 10
+
+
+def test_rejected_credentials_are_forgotten(mocker, asset, credentials, sdk):
+    credentials.record_validated(rate_limit=10)
+    request = httpx.Request("GET", "https://api.platform.censys.io")
+    sdk.account_management.get_organization_details.side_effect = models.SDKError(
+        "error", httpx.Response(401, request=request)
+    )
+
+    with pytest.raises(ActionFailure, match="status code 401"):
+        app_module.test_connectivity.__wrapped__(mocker.MagicMock(), asset)
+
+    assert credentials.get().validated_at is None
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"x-ratelimit-limit": ["10"]}, 10),
+        ({"X-RateLimit-Limit": ["10, 10;w=1"]}, 10),
+        ({"X-RateLimit-Limit": ["10;w=1"]}, 10),
+        ({"X-RateLimit-Limit": ["unlimited"]}, None),
+        ({"content-type": ["application/json"]}, None),
+    ],
+)
+def test_parse_rate_limit(headers, expected):
+    assert parse_rate_limit(headers) == expected
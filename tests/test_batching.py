@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from censys_platform import models
+
+from src.accounting import BudgetExceededError
+from src.actions.batching import BatchLookups, describe_error, run_concurrently
+from src.cache import CredentialCache
+
+
+def sdk_error(status_code: int) -> models.SDKError:
+    request = httpx.Request("POST", "https://api.platform.censys.io")
+    return models.SDKError("error", httpx.Response(status_code, request=request))
+
+
+def resource_response(resource):
+    return SimpleNamespace(
+        result=SimpleNamespace(result=SimpleNamespace(resource=resource))
+    )
+
+
+@pytest.fixture
+def credentials(tmp_path) -> CredentialCache:
+    return CredentialCache("key", 60, tmp_path / "cache.sqlite3")
+
+
+@pytest.fixture
+def sdk(mocker, web):
+    sdk = mocker.MagicMock()
+    sdk.global_data.get_web_properties.side_effect = sdk_error(403)
+
+    def get_web_property(webproperty_id, at_time):
+        if webproperty_id != f"{web.hostname}:{web.port}":
+            raise sdk_error(404)
+        return resource_response(web)
+
+    sdk.global_data.get_web_property.side_effect = get_web_property
+    return sdk
+
+
+def test_falls_back_to_single_lookups_when_batches_are_forbidden(sdk, web, credentials):
+    web_id = f"{web.hostname}:{web.port}"
+    lookups = BatchLookups(credentials)
+
+    found = lookups.fetch(sdk, "web", (web_id, "example.com:8443"))
+
+    assert found == {web_id: web}
+    assert sdk.global_data.get_web_property.call_count == 2
+    assert lookups.available is False
+    assert credentials.get().batch_lookups is False
+
+
+def test_skips_forbidden_batches_once_known(sdk, web, credentials):
+    credentials.record_batch_lookups(False)
+    lookups = BatchLookups(credentials)
+
+    batches = lookups.batches(["a.example.com:443", "b.example.com:443"])
+    lookups.fetch(sdk, "web", batches[0])
+
+    assert batches == [("a.example.com:443",), ("b.example.com:443",)]
+    sdk.global_data.get_web_properties.assert_not_called()
+
+
+def test_records_available_batch_lookups(mocker, cert, credentials):
+    sdk = mocker.MagicMock()
+    sdk.global_data.get_certificates.return_value.result.result = [
+        SimpleNamespace(resource=cert)
+    ]
+    lookups = BatchLookups(credentials)
+
+    found = lookups.fetch(sdk, "cert", (cert.fingerprint_sha256.upper(),))
+
+    assert found == {cert.fingerprint_sha256.lower(): cert}
+    assert credentials.get().batch_lookups is True
+
+
+def test_other_errors_are_raised(sdk, credentials):
+    sdk.global_data.get_web_properties.side_effect = sdk_error(500)
+
+    with pytest.raises(models.SDKError):
+        BatchLookups(credentials).fetch(sdk, "web", ("example.com:443",))
+    assert credentials.get().batch_lookups is None
+
+
+def test_run_concurrently_keeps_order_and_errors():
+    def square(n: int) -> int:
+        if n == 3:
+            raise ValueError(n)
+        return n * n
+
+    outcomes = run_concurrently(square, range(5), concurrency=4)
+
+    assert [(n, result) for n, result, _ in outcomes] == [
+        (0, 0),
+        (1, 1),
+        (2, 4),
+        (3, None),
+        (4, 16),
+    ]
+    assert isinstance(outcomes[3][2], ValueError)
+
+
+@pytest.mark.parametrize(
+    ("err", "expected"),
+    [
+        (
+            BudgetExceededError("Request budget of 1 exhausted"),
+            "Not retrieved: Request budget of 1 exhausted",
+        ),
+        (sdk_error(500), "Failed to retrieve host with status code: 500"),
+        (RuntimeError(), "Failed to retrieve host with generic error"),
+    ],
+)
+def test_describe_error(err, expected):
+    assert describe_error("host", err) == expected
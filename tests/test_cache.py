@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import stat
+import uuid
+
+import pytest
+from censys_platform import models
+
+from src.cache import (
+    CredentialCache,
+    CredentialState,
+    NegativeCache,
+    ResponseCache,
+    connect_cache,
+    credential_key,
+)
+from src.config import Asset
+
+
+def make_asset(**fields) -> Asset:
+    return Asset(
+        api_token=fields.pop("api_token", "token"),
+        organization_id=fields.pop("organization_id", str(uuid.uuid4())),
+        **fields,
+    )
+
+
+def test_creates_private_cache_file(tmp_path):
+    path = tmp_path / "cache" / "cache.sqlite3"
+
+    with connect_cache(path):
+        pass
+
+    assert stat.S_IMODE(path.parent.stat().st_mode) == 0o700
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_tightens_permissions_of_existing_cache_file(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    path.touch()
+    path.chmod(0o644)
+
+    with connect_cache(path):
+        pass
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_refuses_cache_file_owned_by_another_user(tmp_path, mocker):
+    path = tmp_path / "cache.sqlite3"
+    cache = NegativeCache("namespace", {404: 60}, path)
+    cache.put("host", "192.0.2.1", 404)
+
+    mocker.patch("src.cache.os.getuid", return_value=os.getuid() + 1)
+
+    with (
+        pytest.raises(sqlite3.OperationalError, match="owned by another user"),
+        connect_cache(path),
+    ):
+        pass
+    assert cache.get("host", "192.0.2.1") is None
+
+
+def test_negative_results_are_not_shared_between_credentials(tmp_path):
+    asset = make_asset()
+    other_org = make_asset()
+    other_token = make_asset(api_token="other", organization_id=asset.organization_id)
+
+    def cache_for(owner: Asset) -> NegativeCache:
+        return NegativeCache(credential_key(owner), {404: 60}, tmp_path / "c.sqlite3")
+
+    cache_for(asset).put("host", "192.0.2.1", 404)
+
+    assert cache_for(asset).get("host", "192.0.2.1") == 404
+    assert cache_for(other_org).get("host", "192.0.2.1") is None
+    assert cache_for(other_token).get("host", "192.0.2.1") is None
+
+
+def test_responses_are_not_shared_between_credentials(tmp_path, host):
+    asset = make_asset(response_cache_ttl=60)
+    other_org = make_asset(response_cache_ttl=60)
+
+    def cache_for(owner: Asset) -> ResponseCache:
+        return ResponseCache(credential_key(owner), 60, tmp_path / "c.sqlite3")
+
+    cache_for(asset).put("host", host.ip, host)
+
+    assert cache_for(asset).get("host", host.ip, models.Host) == host
+    assert cache_for(other_org).get("host", host.ip, models.Host) is None
+
+
+def test_unreadable_responses_are_discarded(tmp_path, host):
+    cache = ResponseCache("namespace", 60, tmp_path / "c.sqlite3")
+    cache.put("host", host.ip, host)
+    with connect_cache(cache.path) as conn:
+        conn.execute("UPDATE responses SET body = ?", (b'{"ip": 1}',))
+
+    assert cache.get("host", host.ip, models.Host) is None
+    with connect_cache(cache.path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM responses").fetchone() == (0,)
+
+
+def test_responses_are_not_shared_between_sdk_versions(tmp_path, host, mocker):
+    cache = ResponseCache("namespace", 60, tmp_path / "c.sqlite3")
+    cache.put("host", host.ip, host)
+
+    mocker.patch("src.cache.censys_platform.__version__", "0.0.0")
+
+    assert cache.get("host", host.ip, models.Host) is None
+
+
+def test_credential_state_keeps_what_was_learned_separately(tmp_path):
+    credentials = CredentialCache("key", 60, tmp_path / "c.sqlite3")
+    assert credentials.get() == CredentialState()
+
+    credentials.record_batch_lookups(False)
+    credentials.record_validated(rate_limit=10)
+    state = credentials.get()
+
+    assert state.validated_at is not None
+    assert state.batch_lookups is False
+    assert state.rate_limit == 10
+
+    credentials.record_validated(rate_limit=None)
+    assert credentials.get().rate_limit is None
+    assert credentials.get().batch_lookups is False
+
+    credentials.invalidate()
+    assert credentials.get() == CredentialState()
+
+
+def test_credential_state_is_not_kept_without_ttl(tmp_path):
+    credentials = CredentialCache("key", 0, tmp_path / "c.sqlite3")
+
+    credentials.record_validated(rate_limit=10)
+
+    assert credentials.get() == CredentialState()
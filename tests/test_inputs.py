@@ -0,0 +1,132 @@
+import pytest
+
+from src.inputs import (
+    normalize_at_time,
+    normalize_fingerprint,
+    normalize_inputs,
+    normalize_ip,
+    normalize_web_property,
+    refang,
+)
+
+FINGERPRINT = "a" * 32 + "0123456789abcdef" * 2
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("192.0.2[.]1", "192.0.2.1"),
+        ("192(.)0(.)2{.}1", "192.0.2.1"),
+        ("example[dot]com", "example.com"),
+        ("hxxps[://]example.com", "https://example.com"),
+        ("HXXP://example.com", "http://example.com"),
+        ("example.com[:]443", "example.com:443"),
+        ("  example.com  ", "example.com"),
+    ],
+)
+def test_refang(value, expected):
+    assert refang(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("192.0.2.1", "192.0.2.1"),
+        ("192.0.2[.]1", "192.0.2.1"),
+        ("2001:0db8:0000:0000:0000:0000:0000:0001", "2001:db8::1"),
+        ("[2001:db8::1]", "2001:db8::1"),
+        ("2001:DB8::A", "2001:db8::a"),
+    ],
+)
+def test_normalize_ip(value, expected):
+    assert normalize_ip(value) == expected
+
+
+@pytest.mark.parametrize("value", ["192.0.2", "example.com", "2001:db8::g", ""])
+def test_normalize_ip_rejects(value):
+    with pytest.raises(ValueError, match="IPv4 or IPv6"):
+        normalize_ip(value)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("example.com:443", "example.com:443"),
+        ("Example.COM.:8080", "example.com:8080"),
+        ("example[.]com:443", "example.com:443"),
+        ("https://example.com", "example.com:443"),
+        ("http://example.com/path?q=1#top", "example.com:80"),
+        ("hxxps://example[.]com/login", "example.com:443"),
+        ("HTTPS://example.com:8443/", "example.com:8443"),
+        ("https://[2001:db8::1]/", "2001:db8::1:443"),
+        ("[2001:0db8::0001]:8443", "2001:db8::1:8443"),
+        ("192.0.2.1:0080", "192.0.2.1:80"),
+    ],
+)
+def test_normalize_web_property(value, expected):
+    assert normalize_web_property(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "reason"),
+    [
+        ("example.com", "and a port"),
+        ("ftp://example.com", "and a port"),
+        ("example.com:0", "between 1 and 65535"),
+        ("example.com:65536", "between 1 and 65535"),
+        ("example.com:https", "between 1 and 65535"),
+        ("example..com:443", "and a port"),
+        ("intranet:443", "and a port"),
+    ],
+)
+def test_normalize_web_property_rejects(value, reason):
+    with pytest.raises(ValueError, match=reason):
+        normalize_web_property(value)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("2024-01-02T03:04:05Z", "2024-01-02T03:04:05Z"),
+        ("2024-01-02T03:04:05", "2024-01-02T03:04:05Z"),
+        ("2024-01-02T05:04:05+02:00", "2024-01-02T03:04:05Z"),
+        ("2024-01-01T22:04:05.5-05:00", "2024-01-02T03:04:05.500000Z"),
+        (" 2024-01-02 ", "2024-01-02T00:00:00Z"),
+    ],
+)
+def test_normalize_at_time(value, expected):
+    assert normalize_at_time(value) == expected
+
+
+def test_normalize_at_time_rejects():
+    with pytest.raises(ValueError, match="ISO 8601"):
+        normalize_at_time("yesterday")
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        FINGERPRINT,
+        FINGERPRINT.upper(),
+        f"  {FINGERPRINT}\n",
+        ":".join(FINGERPRINT[i : i + 2] for i in range(0, 64, 2)),
+    ],
+)
+def test_normalize_fingerprint(value):
+    assert normalize_fingerprint(value) == FINGERPRINT
+
+
+@pytest.mark.parametrize("value", [FINGERPRINT[:-1], FINGERPRINT + "0", "g" * 64])
+def test_normalize_fingerprint_rejects(value):
+    with pytest.raises(ValueError, match="64 hex characters"):
+        normalize_fingerprint(value)
+
+
+def test_normalize_inputs_reports_rejects_and_drops_duplicates():
+    batch = normalize_inputs("192.0.2.1, 192.0.2[.]1\n2001:db8::1 nope,,", normalize_ip)
+
+    assert batch.accepted == ["192.0.2.1", "2001:db8::1"]
+    assert [(r.value, r.reason) for r in batch.rejected] == [
+        ("nope", "expected an IPv4 or IPv6 address")
+    ]
+    assert batch.duplicates == 1
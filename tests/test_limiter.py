@@ -0,0 +1,183 @@
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import httpx
+import pytest
+
+from src import cache
+from src.cache import CredentialCache, connect_cache, credential_key
+from src.config import Asset
+from src.limiter import (
+    ConcurrencyLimiter,
+    ConcurrencyLimitTimeout,
+    LimitedTransport,
+)
+
+
+@pytest.fixture
+def make_limiter(tmp_path):
+    def make(max_in_flight: int = 1, timeout: float = 5) -> ConcurrencyLimiter:
+        return ConcurrencyLimiter("namespace", max_in_flight, timeout, tmp_path / "c")
+
+    return make
+
+
+def count(limiter: ConcurrencyLimiter, table: str) -> int:
+    with connect_cache(limiter.path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def wait_for(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the condition"
+        time.sleep(0.01)
+
+
+def test_waiters_are_served_in_arrival_order(make_limiter):
+    limiter = make_limiter()
+    held = limiter.acquire()
+    order: list[int] = []
+
+    def wait_and_release(n: int) -> None:
+        waiter = make_limiter()
+        slot = waiter.acquire()
+        order.append(n)
+        waiter.release(slot)
+
+    threads = []
+    for n in range(5):
+        thread = threading.Thread(target=wait_and_release, args=(n,))
+        thread.start()
+        threads.append(thread)
+        # Queue each waiter before the next one arrives
+        wait_for(lambda n=n: count(limiter, "limiter_queue") == n + 1)
+
+    limiter.release(held)
+    for thread in threads:
+        thread.join()
+
+    assert order == [0, 1, 2, 3, 4]
+    assert count(limiter, "limiter_slots") == 0
+    assert count(limiter, "limiter_queue") == 0
+
+
+def test_slots_are_bounded(make_limiter):
+    limiter = make_limiter(max_in_flight=2, timeout=0.05)
+    first, second = limiter.acquire(), limiter.acquire()
+
+    with pytest.raises(ConcurrencyLimitTimeout):
+        limiter.acquire()
+
+    limiter.release(first)
+    third = limiter.acquire()
+    assert third is not None
+    limiter.release(second)
+    limiter.release(third)
+
+
+def test_waiting_times_out_and_leaves_the_queue(make_limiter):
+    limiter = make_limiter(timeout=0.1)
+    held = limiter.acquire()
+
+    started = time.monotonic()
+    with pytest.raises(ConcurrencyLimitTimeout, match=r"^Timed out after 0\.1s"):
+        limiter.acquire()
+
+    assert 0.1 <= time.monotonic() - started < 2
+    assert count(limiter, "limiter_queue") == 0
+    limiter.release(held)
+
+
+def test_slots_of_exited_processes_are_reclaimed(make_limiter):
+    limiter = make_limiter(timeout=1)
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    # The limiter's tables are created by its first acquire
+    limiter.release(limiter.acquire())
+    with connect_cache(limiter.path) as conn:
+        conn.execute(
+            "INSERT INTO limiter_slots (token, namespace, pid, expires_at) VALUES (?, ?, ?, ?)",
+            ("dead", limiter.namespace, process.pid, time.time() + 300),
+        )
+
+    slot = limiter.acquire()
+
+    assert slot is not None
+    assert count(limiter, "limiter_slots") == 1
+    limiter.release(slot)
+
+
+def test_expired_slots_are_reclaimed(make_limiter):
+    limiter = make_limiter(timeout=1)
+    limiter.lease = 0.05
+    limiter.acquire()
+
+    slot = limiter.acquire()
+
+    assert slot is not None
+    limiter.release(slot)
+
+
+def test_one_connection_per_acquire_and_release(make_limiter, mocker):
+    limiter = make_limiter()
+    limiter.release(limiter.acquire())
+    open_cache = mocker.patch("src.limiter.open_cache", wraps=cache.open_cache)
+
+    for _ in range(3):
+        limiter.release(limiter.acquire())
+
+    assert open_cache.call_count == 3
+    assert all(call.kwargs == {"setup": False} for call in open_cache.call_args_list)
+
+
+def test_namespace_is_the_credential_key():
+    asset = Asset(
+        api_token="token",
+        organization_id=str(uuid.uuid4()),
+        max_concurrent_requests=2,
+    )
+
+    limiter = ConcurrencyLimiter.for_asset(asset)
+
+    assert limiter.namespace == credential_key(asset)
+
+
+def test_defaults_to_the_rate_limit_of_validated_credentials(mocker, tmp_path):
+    asset = Asset(api_token="token", organization_id=str(uuid.uuid4()))
+    credentials = CredentialCache(credential_key(asset), 60, tmp_path / "c.sqlite3")
+    mocker.patch.object(CredentialCache, "for_asset", return_value=credentials)
+
+    assert ConcurrencyLimiter.for_asset(asset) is None
+
+    credentials.record_validated(rate_limit=5)
+    assert ConcurrencyLimiter.for_asset(asset).max_in_flight == 5
+
+    asset.max_concurrent_requests = 2
+    assert ConcurrencyLimiter.for_asset(asset).max_in_flight == 2
+
+
+class ChunkStream(httpx.SyncByteStream):
+    """
+    A response body that is only read when iterated, like a real transport's.
+    """
+
+    def __iter__(self):
+        yield b"body"
+
+
+def test_transport_holds_a_slot_until_the_response_is_closed(make_limiter):
+    limiter = make_limiter()
+    transport = LimitedTransport(
+        httpx.MockTransport(lambda _: httpx.Response(200, stream=ChunkStream())),
+        limiter,
+    )
+
+    with httpx.Client(transport=transport) as client:
+        with client.stream("GET", "https://api.example.com") as response:
+            assert count(limiter, "limiter_slots") == 1
+            response.read()
+        assert count(limiter, "limiter_slots") == 0
@@ -0,0 +1,101 @@
+import contextlib
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from src.actions import lookup_cert as lookup_cert_module
+from src.actions.lookup_cert import (
+    GetCertActionOutput,
+    GetCertActionParams,
+    lookup_cert,
+    lookup_cert_view_handler,
+)
+from src.cache import NegativeCache, ResponseCache
+from src.config import Asset
+
+# Registering the action wraps the handler to render its template; test the
+# context it builds instead
+render_view = lookup_cert_view_handler.__wrapped__
+
+
+def cert_output(cert) -> GetCertActionOutput:
+    return GetCertActionOutput.trusted(cert=cert, display_name="example")
+
+
+def test_view_renders_each_certificate_once(cert):
+    other = cert.model_copy(update={"fingerprint_sha256": "0" * 64})
+
+    view = render_view([cert_output(cert), cert_output(other), cert_output(cert)])
+
+    assert [r["fingerprint_sha256"] for r in view["results"]] == [
+        cert.fingerprint_sha256,
+        "0" * 64,
+    ]
+    assert view["total_count"] == 2
+
+
+def test_view_keeps_certificates_without_a_fingerprint(cert):
+    unknown = cert.model_copy(update={"fingerprint_sha256": None})
+
+    view = render_view([cert_output(unknown), cert_output(cert), cert_output(unknown)])
+
+    assert [r["fingerprint_sha256"] for r in view["results"]] == [
+        None,
+        cert.fingerprint_sha256,
+        None,
+    ]
+    assert view["total_count"] == 3
+
+
+@pytest.fixture
+def sdk(mocker, tmp_path, cert):
+    path = tmp_path / "cache.sqlite3"
+    mocker.patch.object(
+        NegativeCache, "for_asset", return_value=NegativeCache("key", {}, path)
+    )
+    mocker.patch.object(
+        ResponseCache, "for_asset", return_value=ResponseCache("key", 0, path)
+    )
+
+    sdk = mocker.MagicMock()
+    sdk.global_data.get_certificate.return_value = SimpleNamespace(
+        result=SimpleNamespace(result=SimpleNamespace(resource=cert))
+    )
+    mocker.patch.object(
+        lookup_cert_module,
+        "create_censys_sdk",
+        return_value=contextlib.nullcontext(sdk),
+    )
+    return sdk
+
+
+@pytest.fixture
+def asset() -> Asset:
+    return Asset(api_token="token", organization_id=str(uuid.uuid4()))
+
+
+def test_fingerprint_is_normalized_before_lookup(mocker, sdk, asset, cert):
+    fingerprint = cert.fingerprint_sha256
+    colon_separated = ":".join(
+        fingerprint[i : i + 2] for i in range(0, len(fingerprint), 2)
+    )
+
+    [result] = lookup_cert(
+        GetCertActionParams(fingerprint_sha256=f" {colon_separated.upper()} "),
+        asset,
+        mocker.MagicMock(),
+    )
+
+    assert result.get_status()
+    sdk.global_data.get_certificate.assert_called_once_with(certificate_id=fingerprint)
+
+
+def test_malformed_fingerprint_is_rejected(mocker, sdk, asset):
+    result = lookup_cert(
+        GetCertActionParams(fingerprint_sha256="abc"), asset, mocker.MagicMock()
+    )
+
+    assert not result.get_status()
+    assert "valid hex SHA256" in result.get_message()
+    sdk.global_data.get_certificate.assert_not_called()
@@ -0,0 +1,77 @@
+from src.actions.lookup_host import (
+    GetHostActionOutput,
+    get_last_scanned_at,
+    lookup_host_view_handler,
+)
+from src.actions.utils import DEFAULT_VIEW_ROW_LIMIT
+
+# Registering the action wraps the handler to render its template; test the
+# context it builds instead
+render_view = lookup_host_view_handler.__wrapped__
+
+
+def host_output(host, service_count: int | None = None) -> GetHostActionOutput:
+    if service_count is not None:
+        # Ports in reverse order, so that rendering has to sort them
+        template = host.services[0]
+        host = host.model_copy(
+            update={
+                "services": [
+                    template.model_copy(
+                        update={"port": port, "protocol": ("HTTP", "SSH")[port % 2]}
+                    )
+                    for port in range(service_count, 0, -1)
+                ]
+            }
+        )
+
+    return GetHostActionOutput.trusted(
+        host=host, is_truncated_host=False, scan_time=get_last_scanned_at(host)
+    )
+
+
+def test_view_renders_every_service_below_the_cap(host, view_context):
+    view = render_view(view_context(), [host_output(host)])
+
+    [result] = view["results"]
+    assert [s["port"] for s in result["services"]] == [22, 80, 443]
+    assert result["service_total"] == 3
+    assert result["service_groups"] == [
+        {"value": "HTTP", "count": 2},
+        {"value": "SSH", "count": 1},
+    ]
+    assert view["total_count"] == 1
+    assert view["show_more_link"] is None
+
+
+def test_view_caps_services_and_links_to_more(host, view_context):
+    service_count = DEFAULT_VIEW_ROW_LIMIT + 5
+
+    view = render_view(
+        view_context(), [host_output(host), host_output(host, service_count)]
+    )
+
+    small, large = view["results"]
+    assert len(small["services"]) == small["service_total"] == 3
+    assert [s["port"] for s in large["services"]] == list(
+        range(1, DEFAULT_VIEW_ROW_LIMIT + 1)
+    )
+    assert large["service_total"] == service_count
+    # Groups count every service, not only the rendered ones
+    assert large["service_groups"] == [
+        {"value": "HTTP", "count": 15},
+        {"value": "SSH", "count": 15},
+    ]
+    assert view["total_count"] == 2
+    assert view["show_more_link"] == "?censys_rows=100"
+
+
+def test_view_renders_the_requested_row_limit(host, view_context):
+    view = render_view(
+        view_context(censys_rows="100"),
+        [host_output(host, DEFAULT_VIEW_ROW_LIMIT + 5)],
+    )
+
+    [result] = view["results"]
+    assert len(result["services"]) == DEFAULT_VIEW_ROW_LIMIT + 5
+    assert view["show_more_link"] is None
@@ -0,0 +1,139 @@
+import contextlib
+import uuid
+from ipaddress import ip_network
+from types import SimpleNamespace
+
+import pytest
+
+from src.actions import lookup_ip_range as lookup_ip_range_module
+from src.actions.lookup_ip_range import (
+    MAX_SUBQUERIES,
+    LookupIpRangeActionParams,
+    lookup_ip_range,
+    parse_ip_range,
+    split_networks,
+)
+from src.cache import CredentialCache
+from src.config import Asset
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("192.0.2.0/24", ["192.0.2.0/24"]),
+        ("192.0.2.7/24", ["192.0.2.0/24"]),
+        ("192.0.2.1", ["192.0.2.1/32"]),
+        ("2001:db8::/126", ["2001:db8::/126"]),
+        ("192.0.2.10-192.0.2.13", ["192.0.2.10/31", "192.0.2.12/31"]),
+        (" 192.0.2.10 - 192.0.2.10 ", ["192.0.2.10/32"]),
+        ("2001:db8::1-2001:db8::3", ["2001:db8::1/128", "2001:db8::2/127"]),
+    ],
+)
+def test_parse_ip_range(value, expected):
+    assert parse_ip_range(value) == [ip_network(n) for n in expected]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "192.0.2.50-192.0.2.10",
+        "192.0.2.1-2001:db8::1",
+        "192.0.2.1-example.com",
+        "192.0.2.0/33",
+        "example.com",
+    ],
+)
+def test_parse_ip_range_rejects_invalid_ranges(value):
+    with pytest.raises(ValueError, match=r"^Invalid (IP address range|CIDR block): "):
+        parse_ip_range(value)
+
+
+def test_split_networks_uses_the_sub_query_prefix_length():
+    networks = split_networks([ip_network("192.0.0.0/22")])
+
+    assert [str(n) for n in networks] == [
+        "192.0.0.0/24",
+        "192.0.1.0/24",
+        "192.0.2.0/24",
+        "192.0.3.0/24",
+    ]
+
+
+@pytest.mark.parametrize("network", ["10.0.0.0/8", "2001:db8::/32"])
+def test_split_networks_caps_the_number_of_sub_queries(network):
+    networks = split_networks([ip_network(network)])
+
+    assert len(networks) == MAX_SUBQUERIES
+    assert sum(n.num_addresses for n in networks) == ip_network(network).num_addresses
+
+
+def test_split_networks_keeps_smaller_networks_whole():
+    networks = split_networks(parse_ip_range("192.0.2.10-192.0.3.255"))
+
+    assert [str(n) for n in networks] == [
+        "192.0.2.10/31",
+        "192.0.2.12/30",
+        "192.0.2.16/28",
+        "192.0.2.32/27",
+        "192.0.2.64/26",
+        "192.0.2.128/25",
+        "192.0.3.0/24",
+    ]
+
+
+@pytest.fixture
+def asset() -> Asset:
+    return Asset(api_token="token", organization_id=str(uuid.uuid4()))
+
+
+@pytest.fixture
+def sdk(mocker, tmp_path):
+    mocker.patch.object(
+        CredentialCache,
+        "for_asset",
+        return_value=CredentialCache("key", 60, tmp_path / "cache.sqlite3"),
+    )
+    sdk = mocker.MagicMock()
+    mocker.patch.object(
+        lookup_ip_range_module,
+        "create_censys_sdk",
+        return_value=contextlib.nullcontext(sdk),
+    )
+    return sdk
+
+
+def run_summary(mocker, asset, **params):
+    soar = mocker.MagicMock()
+    lookup_ip_range(LookupIpRangeActionParams(**params), asset, soar)
+    return soar.set_summary.call_args.args[0]
+
+
+@pytest.mark.parametrize(
+    ("max_hosts", "is_partial"), [(5, False), (4, False), (3, True)]
+)
+def test_range_is_partial_only_when_hosts_were_dropped(
+    mocker, sdk, asset, host, max_hosts, is_partial
+):
+    hosts = [host.model_copy(update={"ip": f"192.0.2.{i}"}) for i in range(4)]
+    sdk.global_data.get_hosts.return_value.result.result = [
+        SimpleNamespace(resource=h) for h in hosts
+    ]
+
+    summary = run_summary(mocker, asset, ip_range="192.0.2.0/30", max_hosts=max_hosts)
+
+    assert summary.host_count == min(max_hosts, 4)
+    assert summary.is_partial is is_partial
+    assert summary.host_batches == 1
+    assert summary.sub_queries == 0
+
+
+def test_large_ranges_report_sub_queries(mocker, sdk, asset):
+    sdk.global_data.search.return_value.result.result = SimpleNamespace(
+        hits=[], next_page_token=""
+    )
+
+    summary = run_summary(mocker, asset, ip_range="192.0.0.0/22")
+
+    assert summary.sub_queries == 4
+    assert summary.host_batches == 0
+    assert summary.is_partial is False
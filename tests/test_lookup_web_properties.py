@@ -0,0 +1,122 @@
+import contextlib
+import uuid
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from censys_platform import models
+
+from src.actions import lookup_web_properties as lookup_web_properties_module
+from src.actions.lookup_web_properties import (
+    LookupWebPropertiesActionParams,
+    lookup_web_properties,
+)
+from src.cache import CredentialCache, NegativeCache
+from src.config import Asset
+
+
+def sdk_error(status_code: int) -> models.SDKError:
+    request = httpx.Request("GET", "https://api.platform.censys.io")
+    return models.SDKError("error", httpx.Response(status_code, request=request))
+
+
+@pytest.fixture
+def asset() -> Asset:
+    return Asset(api_token="token", organization_id=str(uuid.uuid4()))
+
+
+@pytest.fixture
+def credentials(mocker, tmp_path) -> CredentialCache:
+    path = tmp_path / "cache.sqlite3"
+    mocker.patch.object(
+        NegativeCache,
+        "for_asset",
+        return_value=NegativeCache("key", {404: 60, 422: 60}, path),
+    )
+    credentials = CredentialCache("key", 60, path)
+    mocker.patch.object(CredentialCache, "for_asset", return_value=credentials)
+    return credentials
+
+
+@pytest.fixture
+def sdk(mocker, web):
+    web_id = f"{web.hostname}:{web.port}"
+    sdk = mocker.MagicMock()
+
+    def get_web_properties(asset_webproperty_list_input_body):
+        ids = asset_webproperty_list_input_body.webproperty_ids
+        found = [SimpleNamespace(resource=web) for i in ids if i == web_id]
+        return SimpleNamespace(result=SimpleNamespace(result=found))
+
+    def get_web_property(webproperty_id, at_time):
+        if webproperty_id == web_id:
+            return SimpleNamespace(
+                result=SimpleNamespace(result=SimpleNamespace(resource=web))
+            )
+        raise sdk_error(422 if webproperty_id.startswith("invalid") else 404)
+
+    sdk.global_data.get_web_properties.side_effect = get_web_properties
+    sdk.global_data.get_web_property.side_effect = get_web_property
+    mocker.patch.object(
+        lookup_web_properties_module,
+        "create_censys_sdk",
+        side_effect=lambda *_: contextlib.nullcontext(sdk),
+    )
+    return sdk
+
+
+def run(mocker, asset, targets: str):
+    soar = mocker.MagicMock()
+    results = lookup_web_properties(
+        LookupWebPropertiesActionParams(targets=targets), asset, soar
+    )
+    rows = {r.get_data()[0]["target"]: r.get_data()[0] for r in results}
+    return rows, soar.set_summary.call_args.args[0]
+
+
+def requested_ids(sdk) -> list[str]:
+    return [
+        i
+        for call in sdk.global_data.get_web_properties.call_args_list
+        for i in call.kwargs["asset_webproperty_list_input_body"].webproperty_ids
+    ]
+
+
+def test_batch_misses_are_cached(mocker, sdk, asset, credentials, web):
+    web_id = f"{web.hostname}:{web.port}"
+    targets = f"{web_id}, missing.example.com:443"
+
+    run(mocker, asset, targets)
+    sdk.global_data.get_web_properties.reset_mock()
+    rows, summary = run(mocker, asset, targets)
+
+    assert requested_ids(sdk) == [web_id]
+    assert rows[web_id]["found"] is True
+    assert rows["missing.example.com:443"]["error"] == (
+        "Failed to retrieve web property with status code: 404 (cached result)"
+    )
+    assert summary.cache_hits == 1
+
+
+def test_single_lookup_misses_are_cached(mocker, sdk, asset, credentials, web):
+    credentials.record_batch_lookups(False)
+    targets = "missing.example.com:443, invalid.example.com:443"
+
+    run(mocker, asset, targets)
+    assert sdk.global_data.get_web_property.call_count == 2
+    rows, summary = run(mocker, asset, targets)
+
+    assert sdk.global_data.get_web_property.call_count == 2
+    assert rows["missing.example.com:443"]["error"].endswith("404 (cached result)")
+    assert rows["invalid.example.com:443"]["error"].endswith("422 (cached result)")
+    assert summary.cache_hits == 2
+
+
+def test_batch_errors_are_not_cached(mocker, sdk, asset, credentials, web):
+    sdk.global_data.get_web_properties.side_effect = sdk_error(422)
+    targets = "a.example.com:443, b.example.com:443"
+
+    run(mocker, asset, targets)
+    run(mocker, asset, targets)
+
+    assert sdk.global_data.get_web_properties.call_count == 2
@@ -0,0 +1,97 @@
+from src.actions.lookup_web_property import (
+    GetWebPropertyActionOutput,
+    lookup_web_property_view_handler,
+)
+from src.actions.utils import DEFAULT_VIEW_ROW_LIMIT
+
+# Registering the action wraps the handler to render its template; test the
+# context it builds instead
+render_view = lookup_web_property_view_handler.__wrapped__
+
+
+def web_output(web, endpoint_count: int | None = None) -> GetWebPropertyActionOutput:
+    if endpoint_count is not None:
+        # Paths in reverse order, so that rendering has to sort them
+        template = web.endpoints[0]
+        web = web.model_copy(
+            update={
+                "endpoints": [
+                    template.model_copy(
+                        update={
+                            "path": f"/{i:03}",
+                            "endpoint_type": ("HTTP", "API")[i % 2],
+                        }
+                    )
+                    for i in range(endpoint_count, 0, -1)
+                ]
+            }
+        )
+
+    return GetWebPropertyActionOutput.trusted(web=web)
+
+
+def test_view_renders_every_endpoint_below_the_cap(web, view_context):
+    view = render_view(view_context(), [web_output(web)])
+
+    [result] = view["results"]
+    assert [e["path"] for e in result["endpoints"]] == ["/", "/login"]
+    assert result["endpoint_total"] == 2
+    assert result["endpoint_groups"] == [{"value": "HTTP", "count": 2}]
+    assert view["total_count"] == 1
+    assert view["show_more_link"] is None
+
+
+def test_view_caps_endpoints_and_links_to_more(web, view_context):
+    endpoint_count = DEFAULT_VIEW_ROW_LIMIT + 5
+
+    view = render_view(
+        view_context(), [web_output(web), web_output(web, endpoint_count)]
+    )
+
+    small, large = view["results"]
+    assert len(small["endpoints"]) == small["endpoint_total"] == 2
+    assert [e["path"] for e in large["endpoints"]] == [
+        f"/{i:03}" for i in range(1, DEFAULT_VIEW_ROW_LIMIT + 1)
+    ]
+    assert large["endpoint_total"] == endpoint_count
+    # Groups count every endpoint, not only the rendered ones
+    assert large["endpoint_groups"] == [
+        {"value": "API", "count": 15},
+        {"value": "HTTP", "count": 15},
+    ]
+    assert view["total_count"] == 2
+    assert view["show_more_link"] == "?censys_rows=100"
+
+
+def test_view_renders_the_requested_row_limit(web, view_context):
+    view = render_view(
+        view_context(censys_rows="100"),
+        [web_output(web, DEFAULT_VIEW_ROW_LIMIT + 5)],
+    )
+
+    [result] = view["results"]
+    assert len(result["endpoints"]) == DEFAULT_VIEW_ROW_LIMIT + 5
+    assert view["show_more_link"] is None
+
+
+def test_view_shares_certificate_rows_by_fingerprint(web, cert, view_context):
+    known = web.model_copy(update={"cert": cert})
+    unknown = web.model_copy(
+        update={"cert": cert.model_copy(update={"fingerprint_sha256": None})}
+    )
+
+    view = render_view(
+        view_context(),
+        [
+            web_output(known),
+            web_output(unknown),
+            web_output(known),
+            web_output(unknown),
+        ],
+    )
+
+    keys = [r["cert_fingerprint"] for r in view["results"]]
+    assert keys[0] == keys[2] == cert.fingerprint_sha256
+    assert keys[1] != keys[3]
+    assert len(view["certs"]) == 3
+    assert view["certs"][keys[1]]["fingerprint_sha256"] is None
@@ -0,0 +1,51 @@
+import pytest
+from censys_platform import models
+from censys_platform.types import UNSET
+
+from src.actions.projection import (
+    _unwrap_model_type,
+    apply_projection,
+    compile_projection,
+)
+from src.serialization import to_jsonable
+
+Unset = type(UNSET)
+
+
+def nested_paths(model_cls):
+    for name, field in model_cls.model_fields.items():
+        nested_cls = _unwrap_model_type(field.annotation)
+        if nested_cls is None:
+            continue
+        for nested_name in nested_cls.model_fields:
+            yield f"{name}.{nested_name}"
+
+
+def test_keeps_only_projected_fields(host):
+    projection = compile_projection(models.Host, "services.port,location", ("ip",))
+
+    projected = to_jsonable(apply_projection(host, projection))
+
+    assert set(projected) == {"ip", "services", "location"}
+    assert projected["services"] == [{"port": s.port} for s in host.services]
+    assert projected["location"] == to_jsonable(host.location)
+
+
+def test_keeps_unset_fields_unset(host):
+    assert isinstance(host.labels, Unset)
+
+    projected = apply_projection(host, compile_projection(models.Host, "labels.value"))
+
+    assert isinstance(projected.labels, Unset)
+    assert to_jsonable(projected) == {}
+
+
+@pytest.mark.parametrize("path", sorted(nested_paths(models.Host)))
+def test_projects_every_nested_host_path(host, path):
+    projected = apply_projection(host, compile_projection(models.Host, path, ("ip",)))
+
+    assert to_jsonable(projected)["ip"] == host.ip
+
+
+def test_without_projection_returns_model(host):
+    assert apply_projection(host, None) is host
@@ -0,0 +1,200 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from censys_platform import SDK, models
+
+from src.accounting import STREAMING_EXTENSION
+from src.streaming import (
+    JsonArrayScanner,
+    stream_host,
+    stream_search,
+    stream_web_property,
+)
+
+PAYLOADS_DIR = Path(__file__).parent.parent / "loadtest" / "payloads"
+
+# Each recorded payload, with the path of the array the actions stream
+STREAMED_ARRAYS = [
+    ("host", ("result", "resource", "services")),
+    ("webproperty", ("result", "resource", "endpoints")),
+    ("search", ("result", "hits")),
+]
+
+
+def scan(chunks: list[bytes], path: tuple[str, ...]) -> tuple[list, dict]:
+    scanner = JsonArrayScanner(path)
+    items = [json.loads(item) for item in scanner.iter_items(chunks)]
+    return items, json.loads(scanner.skeleton)
+
+
+def split_document(document: dict, path: tuple[str, ...]) -> tuple[list, dict]:
+    skeleton = json.loads(json.dumps(document))
+    parent = skeleton
+    for key in path[:-1]:
+        parent = parent[key]
+    items, parent[path[-1]] = parent[path[-1]], []
+    return items, skeleton
+
+
+@pytest.mark.parametrize(("name", "path"), STREAMED_ARRAYS)
+def test_scanner_matches_json_loads_at_every_chunk_boundary(name, path):
+    data = (PAYLOADS_DIR / f"{name}.json").read_bytes()
+    expected = split_document(json.loads(data), path)
+    assert expected[0], "the payload should have items to stream"
+
+    for i in range(len(data) + 1):
+        assert scan([data[:i], data[i:]], path) == expected, f"split at byte {i}"
+
+
+@pytest.mark.parametrize(("name", "path"), STREAMED_ARRAYS)
+def test_scanner_matches_json_loads_byte_by_byte(name, path):
+    data = (PAYLOADS_DIR / f"{name}.json").read_bytes()
+
+    chunks = [data[i : i + 1] for i in range(len(data))]
+
+    assert scan(chunks, path) == split_document(json.loads(data), path)
+
+
+def test_scanner_handles_escapes_and_nested_arrays():
+    document = {
+        "key": 'a "quoted" [value], {with} \\ structure',
+        "items": [{"nested": [1, [2, {"items": []}]], "s": "]},"}, {}, {"x": "\\"}],
+        "after": {"items": [{"not": "streamed"}]},
+    }
+    data = json.dumps(document).encode()
+
+    for i in range(len(data) + 1):
+        assert scan([data[:i], data[i:]], ("items",)) == split_document(
+            document, ("items",)
+        )
+
+
+def test_scanner_rejects_truncated_documents():
+    data = (PAYLOADS_DIR / "host.json").read_bytes()
+    scanner = JsonArrayScanner(("result", "resource", "services"))
+
+    with pytest.raises(ValueError, match="Truncated JSON document"):
+        list(scanner.iter_items([data[: len(data) // 2]]))
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """
+    Serves one canned response in small chunks, recording the request it was sent.
+    """
+
+    def __init__(self, status_code: int, body: bytes, content_type: str) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.content_type = content_type
+        self.requests: list[httpx.Request] = []
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        self.requests.append(request)
+        chunks = [self.body[i : i + 64] for i in range(0, len(self.body), 64)]
+        return httpx.Response(
+            self.status_code,
+            headers={"content-type": self.content_type},
+            stream=httpx.ByteStream(b"".join(chunks)),
+        )
+
+
+def make_sdk(transport: httpx.BaseTransport) -> SDK:
+    return SDK(
+        organization_id="org-id",
+        personal_access_token="token",
+        server_url="https://api.example.com",
+        client=httpx.Client(transport=transport),
+    )
+
+
+def payload(name: str) -> bytes:
+    return (PAYLOADS_DIR / f"{name}.json").read_bytes()
+
+
+def test_stream_host_sends_the_sdk_request():
+    transport = RecordingTransport(
+        200, payload("host"), "application/vnd.censys.api.v3.host.v1+json"
+    )
+
+    host = stream_host(make_sdk(transport), None, "192.0.2.1", "2026-01-01T00:00:00Z")
+
+    [request] = transport.requests
+    assert request.method == "GET"
+    assert request.url.path == "/v3/global/asset/host/192.0.2.1"
+    assert request.url.params["organization_id"] == "org-id"
+    assert request.url.params["at_time"].startswith("2026-01-01T00:00:00")
+    assert request.headers["authorization"] == "Bearer token"
+    assert request.headers["accept"] == "application/vnd.censys.api.v3.host.v1+json"
+    assert request.extensions[STREAMING_EXTENSION] is True
+
+    expected = models.Host.model_validate(
+        json.loads(payload("host"))["result"]["resource"]
+    )
+    assert host == expected
+
+
+def test_stream_web_property_matches_the_sdk_result():
+    transport = RecordingTransport(
+        200,
+        payload("webproperty"),
+        "application/vnd.censys.api.v3.webproperty.v1+json",
+    )
+    sdk = make_sdk(transport)
+
+    streamed = stream_web_property(sdk, None, "example.com:443")
+    fetched = sdk.global_data.get_web_property(webproperty_id="example.com:443")
+
+    streamed_request, fetched_request = transport.requests
+    assert streamed_request.url == fetched_request.url
+    assert streamed_request.headers == fetched_request.headers
+    assert streamed == fetched.result.result.resource
+
+
+def test_stream_search_sends_the_sdk_request():
+    transport = RecordingTransport(200, payload("search"), "application/json")
+    sdk = make_sdk(transport)
+    body = models.SearchQueryInputBody(query="host.ip: 192.0.2.1", page_size=10)
+    hits = []
+
+    streamed = stream_search(sdk, None, body, hits.append)
+    fetched = sdk.global_data.search(search_query_input_body=body)
+
+    streamed_request, fetched_request = transport.requests
+    assert streamed_request.url == fetched_request.url
+    assert streamed_request.headers == fetched_request.headers
+    assert streamed_request.content == fetched_request.content
+    assert hits == fetched.result.result.hits
+    assert streamed.total_hits == fetched.result.result.total_hits
+    assert streamed.hits == []
+
+
+@pytest.mark.parametrize(
+    ("status_code", "content_type", "body", "error"),
+    [
+        (401, "application/json", b'{"error": {"message": "bad token"}}', None),
+        (
+            404,
+            "application/problem+json",
+            b'{"title": "Not Found", "status": 404}',
+            models.ErrorModel,
+        ),
+        (422, "application/json", b"{}", models.SDKError),
+        (500, "text/plain", b"oops", models.SDKError),
+    ],
+)
+def test_stream_errors_are_raised_like_the_sdk(status_code, content_type, body, error):
+    transport = RecordingTransport(status_code, body, content_type)
+    sdk = make_sdk(transport)
+
+    with pytest.raises(models.SDKBaseError) as streamed:
+        stream_host(sdk, None, "192.0.2.1")
+    with pytest.raises(models.SDKBaseError) as fetched:
+        sdk.global_data.get_host(host_id="192.0.2.1")
+
+    assert type(streamed.value) is type(fetched.value)
+    if error is not None:
+        assert type(streamed.value) is error
+    assert streamed.value.status_code == status_code
@@ -0,0 +1,102 @@
+import contextlib
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from censys_platform import models
+from soar_sdk.exceptions import ActionFailure
+
+from src.actions import warm_cache as warm_cache_module
+from src.actions.warm_cache import WarmCacheActionParams, warm_cache
+from src.cache import CredentialCache, ResponseCache
+from src.config import Asset
+
+
+@pytest.fixture
+def asset() -> Asset:
+    return Asset(
+        api_token="token",
+        organization_id=str(uuid.uuid4()),
+        response_cache_ttl=60,
+    )
+
+
+@pytest.fixture
+def sdk(mocker, tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    mocker.patch.object(
+        ResponseCache, "for_asset", return_value=ResponseCache("key", 60, path)
+    )
+    mocker.patch.object(
+        CredentialCache, "for_asset", return_value=CredentialCache("key", 60, path)
+    )
+
+    sdk = mocker.MagicMock()
+    sdk.global_data.get_hosts.return_value.result.result = []
+    mocker.patch.object(
+        warm_cache_module,
+        "create_censys_sdk",
+        return_value=contextlib.nullcontext(sdk),
+    )
+    return sdk
+
+
+def search_response(*hits: dict):
+    data = models.SearchQueryResponse.model_validate(
+        {
+            "hits": [
+                {kind: {"extensions": {}, **hit} for kind, hit in h.items()}
+                for h in hits
+            ],
+            "next_page_token": "",
+            "previous_page_token": "",
+            "query_duration_millis": 1,
+            "total_hits": len(hits),
+        }
+    )
+    return SimpleNamespace(result=SimpleNamespace(result=data))
+
+
+def rows(results) -> list[dict]:
+    return [result.get_data()[0] for result in results]
+
+
+def test_malformed_query_hits_are_reported_as_invalid(mocker, sdk, asset):
+    sdk.global_data.search.return_value = search_response(
+        {"host_v1": {"resource": {"ip": "192.0.2.1"}}},
+        {"webproperty_v1": {"resource": {"hostname": "intranet", "port": 443}}},
+        {"webproperty_v1": {"resource": {"port": 443}}},
+    )
+
+    results = rows(
+        warm_cache(
+            WarmCacheActionParams(query="host.ip: 192.0.2.1"), asset, mocker.MagicMock()
+        )
+    )
+
+    assert [(r["resource_id"], r["source"], r["status"]) for r in results] == [
+        ("192.0.2.1", "query", "not_found"),
+        ("intranet:443", "query", "invalid"),
+        (":443", "query", "invalid"),
+    ]
+    assert results[1]["error"].startswith("Invalid indicator: ")
+
+
+def test_unexpected_search_errors_fail_the_action(mocker, sdk, asset):
+    sdk.global_data.search.side_effect = RuntimeError("connection reset")
+
+    with pytest.raises(ActionFailure, match="generic error"):
+        warm_cache(WarmCacheActionParams(query="*"), asset, mocker.MagicMock())
+
+
+def test_invalid_inputs_are_reported_once(mocker, sdk, asset):
+    results = rows(
+        warm_cache(
+            WarmCacheActionParams(ips="192.0.2.1, bad, bad"), asset, mocker.MagicMock()
+        )
+    )
+
+    assert [(r["resource_id"], r["status"]) for r in results] == [
+        ("bad", "invalid"),
+        ("192.0.2.1", "not_found"),
+    ]